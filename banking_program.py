@@ -6,36 +6,1239 @@ This is a simple Banking System that allows:
 - Viewing balance
 - Depositing money
 - Withdrawing money
+- A multi-account Bank with thread-safe deposits, withdrawals and transfers
+- Durability: a write-ahead log with group commit, snapshots and recovery
+- Operation counters and latency histograms (Bank.metrics)
+- A JSON-over-TCP asyncio service with per-account request batching, plus
+  a load generator:
+    python banking_program.py serve --data bank_data
+    python banking_program.py loadgen --clients 50
+
+Money is held as integer cents. Decimal is used only to parse what users
+type and to format what they see, so the arithmetic stays exact (no float
+drift) and on plain ints.
 """
 
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal, DecimalException
+from itertools import islice
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+
+class BankError(Exception):
+    """Base class for operations the bank refuses."""
+
+
+class InvalidAmount(BankError, ValueError):
+    pass
+
+
+class InsufficientFunds(BankError):
+    pass
+
+
+class UnknownAccount(BankError, LookupError):
+    pass
+
+
+CENT = Decimal("0.01")
+MAX_AMOUNT_DIGITS = 15  # whole-unit digits an amount may have (up to 999 trillion)
+
+
+def parse_amount(text: Union[str, Decimal, int]) -> int:
+    """
+    '12.34' -> 1234 cents. More than two decimal places is refused, not
+    rounded, and so is anything over MAX_AMOUNT_DIGITS whole digits (checked
+    before any arithmetic, so '1e999999' costs no more than '1').
+    """
+    try:
+        value = Decimal(text.strip() if isinstance(text, str) else text)
+        if not value.is_finite():
+            raise InvalidAmount(f"{text!r} is not a valid amount")
+        if not value:
+            return 0
+        if value.adjusted() >= MAX_AMOUNT_DIGITS:
+            raise InvalidAmount(f"{text!r} is too large an amount")
+        if value != value.quantize(CENT):
+            raise InvalidAmount(f"{text!r} has fractions of a cent")
+    except DecimalException:
+        raise InvalidAmount(f"{text!r} is not a valid amount") from None
+    return int(value.scaleb(2))
+
+
+def plain_amount(cents: int) -> str:
+    """1234 -> '12.34' (for machine-readable output)."""
+    return str(Decimal(cents).scaleb(-2).quantize(CENT))
+
+
+def format_amount(cents: int) -> str:
+    """1234 -> '$12.34'."""
+    return f"${plain_amount(cents)}".replace("$-", "-$")
+
+
+class Receipt(NamedTuple):
+    operation: str   # "deposit" or "withdraw"
+    amount: int      # cents
+    balance: int     # cents, after the operation
+
+
 class BankAccount:
-    """Class representing a simple bank account."""
+    """
+    Class representing a simple bank account (balance in integer cents).
+    Methods return results or raise BankError; showing them is up to the caller.
+    """
 
-    def __init__(self, owner: str, balance: float = 0.0):
+    __slots__ = ("id", "owner", "balance", "lock", "lsn")
+
+    def __init__(self, owner: str, balance: int = 0, account_id: int = -1):
+        self.id = account_id
         self.owner = owner
         self.balance = balance
+        self.lock = threading.Lock()
+        self.lsn = 0  # last log record applied to this account (see Bank)
 
-    def deposit(self, amount: float):
-        """Deposit money into the account."""
-        if amount > 0:
+    def deposit(self, amount: int) -> Receipt:
+        """Deposit money (in cents) into the account."""
+        if type(amount) is not int or amount <= 0:
+            raise InvalidAmount("Deposit amount must be positive.")
+        with self.lock:
             self.balance += amount
-            print(f"✅ Deposited ${amount:.2f}. New balance: ${self.balance:.2f}")
+            return Receipt("deposit", amount, self.balance)
+
+    def withdraw(self, amount: int) -> Receipt:
+        """Withdraw money (in cents) from the account."""
+        if type(amount) is not int or amount <= 0:
+            raise InvalidAmount("Withdrawal amount must be positive.")
+        with self.lock:
+            if amount > self.balance:
+                raise InsufficientFunds("Insufficient funds.")
+            self.balance -= amount
+            return Receipt("withdraw", amount, self.balance)
+
+    def view_balance(self) -> int:
+        """Current account balance in cents."""
+        return self.balance
+
+
+class LatencyHistogram:
+    """Log-scale latency histogram: 8 buckets per power of two nanoseconds."""
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        ns = int(seconds * 1e9) or 1
+        exp = ns.bit_length() - 1
+        key = exp * 8 + ((ns << 3 >> exp) & 7)  # the 3 bits after the leading one pick the sub-bucket
+        buckets = self.buckets
+        buckets[key] = buckets.get(key, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for key, n in list(other.buckets.items()):
+            self.buckets[key] = self.buckets.get(key, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, p: float) -> float:
+        """Upper edge (seconds) of the bucket holding the p-th percentile."""
+        if not self.count:
+            return 0.0
+        rank, seen = p / 100 * self.count, 0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen >= rank:
+                exp, sub = divmod(key, 8)
+                return min(self.max, (2 ** exp) * (1 + (sub + 1) / 8) / 1e9)
+        return 0.0
+
+
+class Metrics:
+    """
+    Counters and per-operation latency histograms. Each thread records into
+    its own shard, so the hot path takes no lock; snapshot() merges them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards: List[Tuple[Dict[str, int], Dict[str, LatencyHistogram]]] = []
+
+    def _shard(self) -> Tuple[Dict[str, int], Dict[str, LatencyHistogram]]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = ({}, {})
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def count(self, name: str, n: int = 1) -> None:
+        counters = self._shard()[0]
+        counters[name] = counters.get(name, 0) + n
+
+    def observe(self, operation: str, outcome: str, seconds: float) -> None:
+        """Count `operation.outcome` (outcome: "ok" or an error name) and time the operation."""
+        counters, latency = self._shard()
+        key = f"{operation}.{outcome}"
+        counters[key] = counters.get(key, 0) + 1
+        hist = latency.get(operation)
+        if hist is None:
+            hist = latency[operation] = LatencyHistogram()
+        hist.add(seconds)
+
+    def snapshot(self) -> dict:
+        """Plain-data copy: {"counters": {...}, "latency_ms": {op: {count, mean, p50, p99, max}}}."""
+        counters: Dict[str, int] = {}
+        latency: Dict[str, LatencyHistogram] = {}
+        with self._lock:
+            shards = list(self._shards)
+        for shard_counters, shard_latency in shards:
+            for name, n in list(shard_counters.items()):
+                counters[name] = counters.get(name, 0) + n
+            for op, h in list(shard_latency.items()):
+                latency.setdefault(op, LatencyHistogram()).merge(h)
+        return {
+            "counters": dict(sorted(counters.items())),
+            "latency_ms": {
+                op: {
+                    "count": h.count,
+                    "mean": round(h.total / h.count * 1000, 4),
+                    "p50": round(h.percentile(50) * 1000, 4),
+                    "p99": round(h.percentile(99) * 1000, 4),
+                    "max": round(h.max * 1000, 4),
+                }
+                for op, h in sorted(latency.items())
+            },
+        }
+
+
+def _check_amount(amount: int) -> None:
+    if type(amount) is not int or amount <= 0:
+        raise InvalidAmount(f"amount must be a positive number of cents, got {amount!r}")
+
+
+SEGMENT_PREFIX, SNAPSHOT_PREFIX = "wal-", "snapshot-"
+SNAPSHOT_EVERY = 1_000_000  # log records between automatic snapshots
+
+
+def _lsn_files(directory: str, prefix: str, suffix: str) -> List[Tuple[int, str]]:
+    """(lsn, path) of files named <prefix><lsn><suffix>, oldest first."""
+    found = []
+    for name in os.listdir(directory):
+        if name.startswith(prefix) and name.endswith(suffix):
+            digits = name[len(prefix):len(name) - len(suffix)]
+            if digits.isdigit():
+                found.append((int(digits), os.path.join(directory, name)))
+    return sorted(found)
+
+
+def _fsync_dir(directory: str) -> None:
+    if hasattr(os, "O_DIRECTORY"):  # make renames and new files durable (POSIX)
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+if os.name == "nt":
+    import msvcrt
+
+    def _try_lock(fd: int) -> None:
+        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+else:
+    import fcntl
+
+    def _try_lock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+def _lock_dir(directory: str) -> int:
+    """Take `<directory>/LOCK` exclusively for as long as the returned fd stays open."""
+    fd = os.open(os.path.join(directory, "LOCK"), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        _try_lock(fd)
+    except OSError:
+        os.close(fd)
+        raise BankError(f"{directory} is in use by another Bank") from None
+    return fd
+
+
+class WriteAheadLog:
+    """
+    Append-only transaction log, one "<lsn> <record>" line per committed
+    change, split into segments named by their first LSN.
+
+    sync="group": committers hand their line to a flusher thread, which
+    writes whatever has queued up with one write and one fsync, then wakes
+    everyone it covered. sync="each" fsyncs every record inline (the
+    baseline); sync="off" never fsyncs (survives a process crash, not a
+    power cut).
+
+    If a write or fsync fails the log is dead: waiters for records it had
+    not made durable and every later append get a BankError, since what
+    reached the disk is no longer known.
+    """
+
+    SYNC_MODES = ("group", "each", "off")
+
+    def __init__(self, directory: str, next_lsn: int = 1, sync: str = "group"):
+        if sync not in self.SYNC_MODES:
+            raise ValueError(f"sync must be one of {', '.join(self.SYNC_MODES)}")
+        self.directory = directory
+        self.sync = sync
+        self.fsyncs = 0
+        self._lock = threading.Lock()
+        self._has_work = threading.Condition(self._lock)
+        self._flushed = threading.Condition(self._lock)
+        self._next = next_lsn
+        self._durable = next_lsn - 1
+        self._pending: list = []
+        self._closed = False
+        self._error: Optional[BaseException] = None  # set once a write or fsync failed
+        self._segment_start = next_lsn
+        self._file = open(self._segment_path(next_lsn), "a", encoding="utf-8")
+        _fsync_dir(directory)
+        self._flusher = None
+        if sync != "each":
+            self._flusher = threading.Thread(target=self._run, name="wal-flusher", daemon=True)
+            self._flusher.start()
+
+    def _segment_path(self, lsn: int) -> str:
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{lsn:020d}.log")
+
+    @property
+    def next_lsn(self) -> int:
+        return self._next
+
+    def append(self, record: str) -> int:
+        """Queue a record and return its LSN; wait(lsn) before acknowledging it."""
+        with self._lock:
+            self._check()
+            lsn = self._next
+            self._next += 1
+            line = f"{lsn} {record}\n"
+            if self.sync == "each":
+                try:
+                    self._file.write(line)
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                except OSError as e:
+                    self._error = e
+                    raise BankError(f"log write failed: {e}") from e
+                self.fsyncs += 1
+                self._durable = lsn
+            else:
+                self._pending.append(line)
+                self._has_work.notify()
+            return lsn
+
+    def wait(self, lsn: int) -> None:
+        """Block until the record with this LSN is on disk."""
+        if self._durable >= lsn:
+            return
+        with self._lock:
+            while self._durable < lsn:
+                self._check()
+                self._flushed.wait()
+
+    def _check(self) -> None:
+        # called with the lock held
+        if self._error is not None:
+            raise BankError(f"log write failed: {self._error}")
+        if self._closed:
+            raise BankError("log closed before the record was written")
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._pending and not self._closed:
+                    self._has_work.wait()
+                if not self._pending:
+                    return
+                batch, self._pending = self._pending, []
+                last = self._next - 1
+            try:
+                lines = []
+                for item in batch:
+                    if isinstance(item, int):  # rotate marker: the new segment starts at this LSN
+                        self._write(lines)
+                        self._switch(item)
+                        lines = []
+                    else:
+                        lines.append(item)
+                self._write(lines)
+            except Exception as e:
+                with self._lock:
+                    self._error = e
+                    self._pending = []
+                    self._flushed.notify_all()
+                return
+            with self._lock:
+                self._durable = last
+                self._flushed.notify_all()
+
+    def _write(self, lines: List[str]) -> None:
+        if lines:
+            self._file.write("".join(lines))
+            self._file.flush()
+            if self.sync == "group":
+                os.fsync(self._file.fileno())
+                self.fsyncs += 1
+
+    def _switch(self, lsn: int) -> None:
+        self._file.close()
+        self._file = open(self._segment_path(lsn), "a", encoding="utf-8")
+        _fsync_dir(self.directory)
+        with self._lock:
+            self._segment_start = lsn
+            self._flushed.notify_all()
+
+    def rotate(self) -> int:
+        """Start a new segment; returns its first LSN once the switch has happened."""
+        with self._lock:
+            start = self._next
+            if self._flusher is None:
+                self._file.close()
+                self._file = open(self._segment_path(start), "a", encoding="utf-8")
+                self._segment_start = start
+            else:
+                self._check()
+                self._pending.append(start)
+                self._has_work.notify()
+                while self._segment_start != start:
+                    if self._error is not None:
+                        raise BankError(f"log write failed: {self._error}")
+                    self._flushed.wait()
+        _fsync_dir(self.directory)
+        return start
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._has_work.notify()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._lock:
+            self._flushed.notify_all()
+        try:
+            self._file.close()
+        except OSError:
+            if self._error is None:
+                raise
+
+
+class Bank:
+    """
+    Accounts indexed by id (their position in one list, so lookups are a
+    single index even with millions of accounts). Every account carries its
+    own lock; a transfer takes both locks in id order, so two opposite
+    transfers can never wait on each other.
+
+    With a data directory every change is logged (WriteAheadLog) before it
+    is acknowledged, and snapshots are taken every `snapshot_every` records.
+    Snapshots are fuzzy: each account is copied under its own lock together
+    with the LSN of the last record applied to it, and recovery replays
+    from the snapshot's starting LSN, skipping records an account already
+    reflects. Restart cost is one snapshot plus at most one interval of log.
+    The directory is locked for the Bank's lifetime: recovery trims the log,
+    so a second Bank on a live directory must not get that far.
+
+    `metrics` counts every operation by outcome and times it, commit wait
+    included (see Metrics.snapshot() and stats()).
+    """
+
+    def __init__(self, data_dir: Optional[str] = None, sync: str = "group",
+                 snapshot_every: int = SNAPSHOT_EVERY):
+        self.metrics = Metrics()
+        self._accounts: List[BankAccount] = []
+        self._open_lock = threading.Lock()
+        self._wal: Optional[WriteAheadLog] = None
+        self.data_dir = data_dir
+        self.snapshot_every = snapshot_every
+        self._snapshot_lsn = 0
+        self._snapshotting = threading.Lock()
+        self._dir_lock: Optional[int] = None
+        if data_dir is not None:
+            os.makedirs(data_dir, exist_ok=True)
+            self._dir_lock = _lock_dir(data_dir)
+            try:
+                next_lsn = self._recover()
+                self._wal = WriteAheadLog(data_dir, next_lsn, sync)
+            except BaseException:
+                os.close(self._dir_lock)
+                raise
+
+    def __len__(self) -> int:
+        return len(self._accounts)
+
+    def __enter__(self) -> "Bank":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._snapshotting:  # let a background snapshot finish while its log is open
+            if self._wal is not None:
+                self._wal.close()
+                self._wal = None
+        if self._dir_lock is not None:
+            os.close(self._dir_lock)
+            self._dir_lock = None
+
+    # -- logging ---------------------------------------------------------
+
+    def _log(self, record: str) -> int:
+        # called with the affected accounts locked, so per-account log
+        # order always matches the order changes were applied in memory
+        return self._wal.append(record) if self._wal is not None else 0
+
+    def _commit(self, lsn: int) -> None:
+        if not lsn:
+            return
+        self._wal.wait(lsn)
+        if lsn - self._snapshot_lsn >= self.snapshot_every and self._snapshotting.acquire(blocking=False):
+            self._snapshot_lsn = lsn  # don't let other committers start one too
+            threading.Thread(target=self._background_snapshot, daemon=True).start()
+
+    def _background_snapshot(self) -> None:
+        try:
+            self._snapshot()
+        finally:
+            self._snapshotting.release()
+
+    def snapshot(self) -> int:
+        """Write a snapshot now and drop the log it makes redundant; returns its LSN."""
+        with self._snapshotting:
+            return self._snapshot()
+
+    def _snapshot(self) -> int:
+        if self._wal is None:
+            raise BankError("snapshots need a data directory")
+        self._wal.rotate()
+        with self._open_lock:
+            begin = self._wal.next_lsn
+            count = len(self._accounts)
+        path = os.path.join(self.data_dir, f"{SNAPSHOT_PREFIX}{begin:020d}.snap")
+        tmp = path + ".tmp"
+        newest = 0
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(f"{begin} {count}\n")
+            owner, owner_json = None, ""
+            for account in islice(self._accounts, count):
+                with account.lock:
+                    balance, lsn = account.balance, account.lsn
+                newest = max(newest, lsn)
+                if account.owner is not owner:
+                    owner, owner_json = account.owner, json.dumps(account.owner)
+                f.write(f"{balance} {lsn} {owner_json}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        # everything the snapshot shows must also be in the durable log, or a
+        # transfer caught half-way through the scan could not be completed
+        self._wal.wait(newest)
+        os.replace(tmp, path)
+        _fsync_dir(self.data_dir)
+        self._snapshot_lsn = begin
+        # older snapshots, and segments wholly before `begin`, are now redundant
+        for lsn, old in _lsn_files(self.data_dir, SNAPSHOT_PREFIX, ".snap"):
+            if lsn < begin:
+                os.remove(old)
+        segments = _lsn_files(self.data_dir, SEGMENT_PREFIX, ".log")
+        for (start, old), (following, _) in zip(segments, segments[1:]):
+            if following <= begin:
+                os.remove(old)
+        return begin
+
+    def _recover(self) -> int:
+        """Load the newest snapshot, replay the log after it; returns the next LSN."""
+        for name in os.listdir(self.data_dir):
+            if name.startswith(SNAPSHOT_PREFIX) and name.endswith(".snap.tmp"):
+                os.remove(os.path.join(self.data_dir, name))  # a snapshot cut short before its rename
+        begin = 1
+        snapshots = _lsn_files(self.data_dir, SNAPSHOT_PREFIX, ".snap")
+        if snapshots:
+            with open(snapshots[-1][1], encoding="utf-8") as f:
+                begin, count = map(int, f.readline().split())
+                owners: Dict[str, str] = {}
+                for account_id, line in zip(range(count), f):
+                    balance, lsn, owner_json = line.rstrip("\n").split(" ", 2)
+                    owner = owners.get(owner_json)
+                    if owner is None:
+                        owner = owners[owner_json] = json.loads(owner_json)
+                    account = BankAccount(owner, int(balance), account_id)
+                    account.lsn = int(lsn)
+                    self._accounts.append(account)
+        self._snapshot_lsn = begin
+        last = begin - 1
+        segments = _lsn_files(self.data_dir, SEGMENT_PREFIX, ".log")
+        for i, (start, path) in enumerate(segments):
+            if i + 1 < len(segments) and segments[i + 1][0] <= begin:
+                continue
+            last = max(last, self._replay(path, begin, is_last=i == len(segments) - 1))
+        return last + 1
+
+    def _replay(self, path: str, begin: int, is_last: bool) -> int:
+        accounts = self._accounts
+        last = 0
+        with open(path, "rb") as f:
+            data = f.read()
+        good = 0
+        for raw in data.splitlines(keepends=True):
+            try:
+                if not raw.endswith(b"\n"):
+                    raise ValueError("torn record")
+                lsn_text, op, rest = raw.decode("utf-8").rstrip("\n").split(" ", 2)
+                lsn = int(lsn_text)
+                if lsn >= begin:
+                    if op == "D":
+                        a, cents = map(int, rest.split())
+                        if lsn > accounts[a].lsn:
+                            accounts[a].balance += cents
+                            accounts[a].lsn = lsn
+                    elif op == "W":
+                        a, cents = map(int, rest.split())
+                        if lsn > accounts[a].lsn:
+                            accounts[a].balance -= cents
+                            accounts[a].lsn = lsn
+                    elif op == "T":
+                        a, b, cents = map(int, rest.split())
+                        if lsn > accounts[a].lsn:
+                            accounts[a].balance -= cents
+                            accounts[a].lsn = lsn
+                        if lsn > accounts[b].lsn:
+                            accounts[b].balance += cents
+                            accounts[b].lsn = lsn
+                    elif op == "O":
+                        first, count, cents, owner_json = rest.split(" ", 3)
+                        first, count = int(first), int(count)
+                        if first + count > len(accounts):
+                            owner = json.loads(owner_json)
+                            for account_id in range(len(accounts), first + count):
+                                account = BankAccount(owner, int(cents), account_id)
+                                account.lsn = lsn
+                                accounts.append(account)
+                    else:
+                        raise ValueError(f"unknown record {op!r}")
+                last = lsn
+            except (ValueError, IndexError):
+                if not is_last:
+                    raise BankError(f"corrupt log record in {path} at byte {good}") from None
+                # a record torn by a crash mid-write was never acknowledged: drop it
+                with open(path, "r+b") as f:
+                    f.truncate(good)
+                break
+            good += len(raw)
+        return last
+
+    # -- accounts and transactions ---------------------------------------
+
+    def open_account(self, owner: str, balance: int = 0) -> int:
+        """Create an account (opening balance in cents) and return its id."""
+        return self.open_accounts(owner, 1, balance).start
+
+    def open_accounts(self, owner: str, count: int, balance: int = 0) -> range:
+        """Create `count` accounts at once; returns their ids."""
+        if type(balance) is not int or balance < 0:
+            raise InvalidAmount(f"opening balance must be non-negative cents, got {balance!r}")
+        with self._open_lock:
+            start = len(self._accounts)
+            lsn = self._log(f"O {start} {count} {balance} {json.dumps(owner)}")
+            for i in range(start, start + count):
+                account = BankAccount(owner, balance, i)
+                account.lsn = lsn
+                self._accounts.append(account)
+        self._commit(lsn)
+        return range(start, start + count)
+
+    def account(self, account_id: int) -> BankAccount:
+        if not 0 <= account_id < len(self._accounts):
+            raise UnknownAccount(f"no account {account_id}")
+        return self._accounts[account_id]
+
+    def balance(self, account_id: int) -> int:
+        return self.account(account_id).balance
+
+    def deposit(self, account_id: int, amount: int) -> int:
+        """Add `amount` cents; returns the new balance."""
+        return self._run("deposit", account_id, amount)
+
+    def withdraw(self, account_id: int, amount: int) -> int:
+        """Take out `amount` cents; returns the new balance."""
+        return self._run("withdraw", account_id, amount)
+
+    def transfer(self, src_id: int, dst_id: int, amount: int) -> Tuple[int, int]:
+        """Move `amount` cents between two accounts atomically; returns both new balances."""
+        return self._run("transfer", src_id, dst_id, amount)
+
+    def _run(self, op: str, *args):
+        start = time.perf_counter()
+        try:
+            result, lsn = self._OPS[op](self, *args)
+            self._commit(lsn)
+        except BankError as e:
+            self.metrics.observe(op, type(e).__name__, time.perf_counter() - start)
+            raise
+        self.metrics.observe(op, "ok", time.perf_counter() - start)
+        return result
+
+    def stats(self) -> dict:
+        """Metrics snapshot plus the size of the bank and, when durable, of its log."""
+        data = self.metrics.snapshot()
+        data["accounts"] = len(self._accounts)
+        if self._wal is not None:
+            data["log"] = {"records": self._wal.next_lsn - 1, "fsyncs": self._wal.fsyncs,
+                           "sync": self._wal.sync}
+        return data
+
+    def execute(self, ops: Sequence[tuple]) -> list:
+        """
+        Run several operations, e.g. ("deposit", 7, 500) or ("transfer", 7, 9, 250),
+        and wait for the log once for all of them. Each result is what the
+        operation returns, or the BankError it raised.
+        """
+        start = time.perf_counter()
+        results, newest = [], 0
+        outcomes: Dict[str, int] = {}
+        for op in ops:
+            func = self._OPS.get(op[0])
+            try:
+                if func is None:
+                    raise BankError(f"unknown operation {op[0]!r}")
+                result, lsn = func(self, *op[1:])
+            except BankError as e:
+                results.append(e)
+                key = f"{op[0]}.{type(e).__name__}"
+            else:
+                results.append(result)
+                newest = max(newest, lsn)
+                key = f"{op[0]}.ok"
+            outcomes[key] = outcomes.get(key, 0) + 1
+        self._commit(newest)
+        for key, n in outcomes.items():
+            self.metrics.count(key, n)
+        self.metrics.count("execute.operations", len(ops))
+        self.metrics.observe("execute", "ok", time.perf_counter() - start)
+        return results
+
+    # The _deposit/_withdraw/_transfer halves apply and log a change but
+    # return before it is durable: (result, lsn) for _commit().
+
+    def _deposit(self, account_id: int, amount: int) -> Tuple[int, int]:
+        _check_amount(amount)
+        account = self.account(account_id)
+        with account.lock:
+            # log first: if the log refuses the record, nothing has changed
+            account.lsn = lsn = self._log(f"D {account_id} {amount}")
+            account.balance += amount
+            return account.balance, lsn
+
+    def _withdraw(self, account_id: int, amount: int) -> Tuple[int, int]:
+        _check_amount(amount)
+        account = self.account(account_id)
+        with account.lock:
+            if amount > account.balance:
+                raise InsufficientFunds(f"account {account_id} has {format_amount(account.balance)}, "
+                                        f"needs {format_amount(amount)}")
+            account.lsn = lsn = self._log(f"W {account_id} {amount}")
+            account.balance -= amount
+            return account.balance, lsn
+
+    def _transfer(self, src_id: int, dst_id: int, amount: int) -> Tuple[Tuple[int, int], int]:
+        _check_amount(amount)
+        if src_id == dst_id:
+            raise InvalidAmount("cannot transfer to the same account")
+        src, dst = self.account(src_id), self.account(dst_id)
+        first, second = (src, dst) if src_id < dst_id else (dst, src)
+        with first.lock, second.lock:
+            if amount > src.balance:
+                raise InsufficientFunds(f"account {src_id} has {format_amount(src.balance)}, "
+                                        f"needs {format_amount(amount)}")
+            src.lsn = dst.lsn = lsn = self._log(f"T {src_id} {dst_id} {amount}")
+            src.balance -= amount
+            dst.balance += amount
+            return (src.balance, dst.balance), lsn
+
+    def _balance(self, account_id: int) -> Tuple[int, int]:
+        return self.account(account_id).balance, 0
+
+    _OPS = {"deposit": _deposit, "withdraw": _withdraw, "transfer": _transfer, "balance": _balance}
+
+    def total(self) -> int:
+        """Sum of all balances in cents (consistent only while no transaction is running)."""
+        return sum(a.balance for a in self._accounts)
+
+
+def _bench_worker(bank: Bank, transactions: int, seed: int) -> Tuple[int, int, int]:
+    rng = random.Random(seed)
+    n = len(bank)
+    net = 0  # money that entered (deposits) minus money that left (withdrawals)
+    done = refused = 0
+    for _ in range(transactions):
+        a, kind = rng.randrange(n), rng.random()
+        amount = rng.randint(1, 5000)
+        try:
+            if kind < 0.6:
+                b = rng.randrange(n - 1)
+                bank.transfer(a, b + (b >= a), amount)
+            elif kind < 0.8:
+                bank.deposit(a, amount)
+                net += amount
+            else:
+                bank.withdraw(a, amount)
+                net -= amount
+            done += 1
+        except InsufficientFunds:
+            refused += 1
+    return net, done, refused
+
+
+def bench_bank(accounts: int = 1_000_000, threads: int = 8, transactions: int = 400_000) -> None:
+    """Transactions per second under a thread pool; checks that no money appears or vanishes."""
+    for n in (accounts, 16):  # spread out, then everyone fighting over a few locks
+        bank = Bank()
+        start = time.perf_counter()
+        bank.open_accounts("bench", n, 10_000)
+        opened = time.perf_counter() - start
+        initial = bank.total()
+        per_thread = transactions // threads
+        start = time.perf_counter()
+        with ThreadPoolExecutor(threads) as pool:
+            results = list(pool.map(lambda i: _bench_worker(bank, per_thread, i), range(threads)))
+        elapsed = time.perf_counter() - start
+        net = sum(r[0] for r in results)
+        done = sum(r[1] for r in results)
+        refused = sum(r[2] for r in results)
+        total = bank.total()
+        status = "conserved" if total == initial + net else f"MISMATCH ({total} != {initial + net})"
+        print(f"{n:>9,} accounts (opened in {opened:.2f}s), {threads} threads: "
+              f"{(done + refused) / elapsed:10,.0f} tx/s, {refused:,} refused, balances {status}")
+        for op, lat in bank.stats()["latency_ms"].items():
+            print(f"    {op:9s} n={lat['count']:<8,} p50 {lat['p50'] * 1000:7.1f} µs  p99 {lat['p99'] * 1000:7.1f} µs")
+
+
+def _random_transactions(n: int, accounts: int, seed: int):
+    # (kind, a, b, cents): 0 deposit, 1 withdraw, 2 transfer; amounts up to $100.00
+    rng = random.Random(seed)
+    randrange, randint, rand = rng.randrange, rng.randint, rng.random
+    for _ in range(n):
+        r = rand()
+        yield (0 if r < 0.3 else 1 if r < 0.5 else 2), randrange(accounts), randrange(accounts), randint(1, 10_000)
+
+
+def verify_replay(transactions: int = 10_000_000, accounts: int = 1_000, seed: int = 22) -> bool:
+    """
+    Replay random deposits/withdrawals/transfers through Bank and check the
+    result to the cent against an independent tally; the same stream on
+    float dollars is replayed alongside to show the drift cents avoid.
+    """
+    bank = Bank()
+    bank.open_accounts("replay", accounts, 1_000_00)
+    expected = [1_000_00] * accounts
+    floats = [1000.0] * accounts
+    deposited = withdrawn = 0
+    start = time.perf_counter()
+    for kind, a, b, cents in _random_transactions(transactions, accounts, seed):
+        dollars = cents / 100
+        if kind == 0:
+            bank.deposit(a, cents)
+            expected[a] += cents
+            floats[a] += dollars
+            deposited += cents
+        elif expected[a] < cents or (kind == 2 and a == b):
+            continue  # would be refused; the float ledger skips it too
+        elif kind == 1:
+            bank.withdraw(a, cents)
+            expected[a] -= cents
+            floats[a] -= dollars
+            withdrawn += cents
         else:
-            print("❌ Deposit amount must be positive.")
-
-    def withdraw(self, amount: float):
-        """Withdraw money from the account."""
-        if amount > self.balance:
-            print("❌ Insufficient funds.")
-        elif amount <= 0:
-            print("❌ Withdrawal amount must be positive.")
+            bank.transfer(a, b, cents)
+            expected[a] -= cents
+            expected[b] += cents
+            floats[a] -= dollars
+            floats[b] += dollars
+    elapsed = time.perf_counter() - start
+    balances = [bank.balance(i) for i in range(accounts)]
+    exact = balances == expected and bank.total() == accounts * 1_000_00 + deposited - withdrawn
+    errors = [abs(Decimal(f) - Decimal(c).scaleb(-2)) for f, c in zip(floats, expected)]
+    print(f"{transactions:,} transactions in {elapsed:.1f}s: cents {'exact' if exact else 'MISMATCH'}; "
+          f"float ledger: {sum(1 for e in errors if e):,} of {accounts:,} balances inexact, "
+          f"worst off by ${float(max(errors)):.3g}")
+    return exact
+
+
+def bench_money(transactions: int = 2_000_000, accounts: int = 1_000) -> None:
+    """Hot-path arithmetic: float dollars vs integer cents (vs Decimal, for scale)."""
+    stream = list(_random_transactions(transactions, accounts, 7))
+    for label, convert, zero in (
+        ("float", lambda c: c / 100, 0.0),
+        ("int cents", lambda c: c, 0),
+        ("Decimal", lambda c: Decimal(c).scaleb(-2), Decimal(0)),
+    ):
+        ops = [(kind, a, b, convert(c)) for kind, a, b, c in stream]
+        balances = [zero] * accounts
+        start = time.perf_counter()
+        for kind, a, b, amount in ops:
+            if kind == 0:
+                balances[a] += amount
+            elif amount <= balances[a]:
+                balances[a] -= amount
+                if kind == 2:
+                    balances[b] += amount
+        elapsed = time.perf_counter() - start
+        print(f"{label:10s} {transactions / elapsed / 1e6:6.2f} M tx/s")
+
+
+def show_receipt(receipt: Receipt) -> str:
+    done = "Deposited" if receipt.operation == "deposit" else "Withdrew"
+    return f"✅ {done} {format_amount(receipt.amount)}. New balance: {format_amount(receipt.balance)}"
+
+
+def _read_amount(prompt: str) -> int:
+    return parse_amount(input(prompt))
+
+
+def bench_wal(transactions: int = 20_000, threads: int = 16, accounts: int = 10_000) -> None:
+    """Commit throughput per sync mode, then recovery time with and without a snapshot."""
+    import shutil
+    import tempfile
+
+    root = tempfile.mkdtemp(prefix="bank-wal-")
+    try:
+        for sync in ("each", "group", "off"):
+            path = os.path.join(root, sync)
+            with Bank(path, sync=sync) as bank:
+                bank.open_accounts("bench", accounts, 10_000)
+                per_thread = transactions // threads
+                start = time.perf_counter()
+                with ThreadPoolExecutor(threads) as pool:
+                    results = list(pool.map(lambda i: _bench_worker(bank, per_thread, i), range(threads)))
+                elapsed = time.perf_counter() - start
+                expected = accounts * 10_000 + sum(r[0] for r in results)
+                fsyncs = bank._wal.fsyncs
+            print(f"sync={sync:5s} {per_thread * threads / elapsed:9,.0f} tx/s   {fsyncs:7,} fsyncs")
+
+            start = time.perf_counter()
+            with Bank(path, sync=sync) as bank:
+                recovered = time.perf_counter() - start
+                ok = bank.total() == expected
+                bank.snapshot()
+            start = time.perf_counter()
+            with Bank(path, sync=sync) as bank:
+                from_snapshot = time.perf_counter() - start
+                ok = ok and bank.total() == expected
+            print(f"           recovery: full log {recovered * 1000:7.1f} ms, from snapshot "
+                  f"{from_snapshot * 1000:7.1f} ms, balances {'match' if ok else 'MISMATCH'}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+SERVICE_HOST, SERVICE_PORT = "127.0.0.1", 8765
+MAX_BATCH = 512
+MAX_OPEN = 10_000  # accounts one "open" request may create
+
+
+class BankService:
+    """
+    asyncio front end speaking newline-delimited JSON over TCP, e.g.
+        {"id": 1, "op": "transfer", "account": 7, "to": 9, "amount": "2.50"}
+     -> {"id": 1, "ok": true, "balance": "97.50", "to_balance": "102.50"}
+    Clients may pipeline; replies carry the request id.
+
+    Requests are queued per account (a transfer by its source). Everything
+    queued when the loop comes round is handed to one Bank.execute() call
+    on a worker thread, account by account, so a burst costs one thread hop
+    and one log wait instead of one per request. Up to `max_inflight`
+    batches run at once (one fills while another waits for its fsync); an
+    account with a batch in flight is held back, keeping its order.
+    """
+
+    def __init__(self, bank: Bank, max_inflight: int = 4, max_batch: int = MAX_BATCH):
+        self.bank = bank
+        self.max_inflight = max_inflight
+        self.max_batch = max_batch
+        self._executor = ThreadPoolExecutor(max_inflight + 1, thread_name_prefix="bank")
+        self._queues: Dict[int, list] = {}
+        self._busy: set = set()
+        self._inflight = 0
+        self._scheduled = False
+        self.requests = self.batches = 0
+
+    async def submit(self, op: tuple):
+        """Queue one Bank.execute() operation; returns its result (or BankError)."""
+        future = asyncio.get_running_loop().create_future()
+        self.requests += 1
+        self._queues.setdefault(op[1], []).append((op, future))
+        self._schedule()
+        return await future
+
+    def _schedule(self) -> None:
+        if not self._scheduled:
+            self._scheduled = True
+            asyncio.get_running_loop().call_soon(self._dispatch)
+
+    def _dispatch(self) -> None:
+        self._scheduled = False
+        while self._inflight < self.max_inflight:
+            batch, keys = [], []
+            for key in list(self._queues):
+                if key in self._busy:
+                    continue
+                batch.extend(self._queues.pop(key))
+                keys.append(key)
+                if len(batch) >= self.max_batch:
+                    break
+            if not batch:
+                return
+            self._busy.update(keys)
+            self._inflight += 1
+            self.batches += 1
+            asyncio.get_running_loop().create_task(self._run(batch, keys))
+
+    async def _run(self, batch: list, keys: list) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self._executor, self.bank.execute, [op for op, _ in batch])
+        except Exception as e:  # e.g. the log failed: every request in the batch fails
+            results = [e] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+        self._busy.difference_update(keys)
+        self._inflight -= 1
+        self._schedule()
+
+    async def handle(self, request: dict) -> dict:
+        rid = request.get("id")
+        try:
+            op = request["op"]
+            if op == "open":
+                count = int(request.get("count", 1))
+                if not 1 <= count <= MAX_OPEN:
+                    raise BankError(f"count must be from 1 to {MAX_OPEN}")
+                cents = parse_amount(str(request.get("amount", "0")))
+                loop = asyncio.get_running_loop()
+                ids = await loop.run_in_executor(
+                    None, self.bank.open_accounts, str(request.get("owner", "")), count, cents)
+                return {"id": rid, "ok": True, "first": ids.start, "count": count}
+            if op == "metrics":
+                data = self.bank.stats()
+                data["service"] = {"requests": self.requests, "batches": self.batches}
+                return {"id": rid, "ok": True, "metrics": data}
+            account = int(request["account"])
+            if op == "balance":
+                result = await self.submit(("balance", account))
+            elif op in ("deposit", "withdraw"):
+                result = await self.submit((op, account, parse_amount(str(request["amount"]))))
+            elif op == "transfer":
+                result = await self.submit((op, account, int(request["to"]), parse_amount(str(request["amount"]))))
+            else:
+                raise BankError(f"unknown operation {op!r}")
+        except BankError as e:
+            result = e
+        except KeyError as e:
+            result = BankError(f"missing field {e.args[0]!r}")
+        except (TypeError, ValueError, OverflowError) as e:
+            result = BankError(f"bad request: {e}")
+        if isinstance(result, Exception):
+            return {"id": rid, "ok": False, "error": type(result).__name__, "message": str(result)}
+        if isinstance(result, tuple):
+            return {"id": rid, "ok": True, "balance": plain_amount(result[0]), "to_balance": plain_amount(result[1])}
+        return {"id": rid, "ok": True, "balance": plain_amount(result)}
+
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        tasks = set()
+
+        async def answer(line: bytes) -> None:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+            except ValueError as e:
+                reply = {"id": None, "ok": False, "error": "BadRequest", "message": str(e)}
+            else:
+                try:
+                    reply = await self.handle(request)
+                except Exception as e:  # never leave a pipelining client short of a reply
+                    reply = {"id": request.get("id"), "ok": False, "error": "InternalError",
+                             "message": f"{type(e).__name__}: {e}"}
+            writer.write(json.dumps(reply).encode() + b"\n")
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # over the stream limit: the rest can no longer be framed
+                    writer.write(json.dumps({"id": None, "ok": False, "error": "BadRequest",
+                                             "message": "request line too long"}).encode() + b"\n")
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.create_task(answer(line))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                if writer.transport.get_write_buffer_size() > 1 << 20:
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            # requests already read still get their replies
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+            writer.close()
+
+    async def serve(self, host: str = SERVICE_HOST, port: int = SERVICE_PORT) -> None:
+        server = await asyncio.start_server(self._connection, host, port, limit=1 << 16)
+        print(f"🏦 SimpleBank service listening on {host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+    def close(self) -> None:
+        self._executor.shutdown()
+
+
+def serve(data_dir: Optional[str], host: str, port: int, sync: str) -> None:
+    with Bank(data_dir, sync=sync) as bank:
+        service = BankService(bank)
+        try:
+            asyncio.run(service.serve(host, port))
+        except KeyboardInterrupt:
+            print("\n👋 Service stopped.")
+        finally:
+            service.close()
+
+
+async def _load_client(host: str, port: int, first: int, accounts: int, requests: int, window: int,
+                       seed: int, latencies: List[float], outcomes: Dict[str, int]) -> None:
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port, limit=1 << 16)
+    slots = asyncio.Semaphore(window)
+    sent: Dict[int, float] = {}
+
+    async def receive() -> None:
+        for _ in range(requests):
+            reply = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - sent.pop(reply["id"]))
+            key = "ok" if reply["ok"] else reply["error"]
+            outcomes[key] = outcomes.get(key, 0) + 1
+            slots.release()
+
+    receiver = asyncio.create_task(receive())
+    for i in range(requests):
+        await slots.acquire()
+        a, kind = first + rng.randrange(accounts), rng.random()
+        amount = f"{rng.randint(1, 5000) / 100:.2f}"
+        if kind < 0.5:
+            b = first + rng.randrange(accounts - 1)
+            request = {"id": i, "op": "transfer", "account": a, "to": b + (b >= a), "amount": amount}
+        elif kind < 0.7:
+            request = {"id": i, "op": "deposit", "account": a, "amount": amount}
+        elif kind < 0.9:
+            request = {"id": i, "op": "withdraw", "account": a, "amount": amount}
         else:
-            self.balance -= amount
-            print(f"✅ Withdrew ${amount:.2f}. New balance: ${self.balance:.2f}")
+            request = {"id": i, "op": "balance", "account": a}
+        sent[i] = time.perf_counter()
+        writer.write(json.dumps(request).encode() + b"\n")
+        if i % 64 == 0:
+            await writer.drain()
+    await receiver
+    writer.close()
+
+
+async def _run_load(host: str, port: int, clients: int, requests: int, accounts: int, window: int) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    first = None
+    for opened in range(0, accounts, MAX_OPEN):  # the service opens at most MAX_OPEN per request
+        count = min(MAX_OPEN, accounts - opened)
+        writer.write(json.dumps({"id": opened, "op": "open", "owner": "load", "count": count,
+                                 "amount": "100.00"}).encode() + b"\n")
+        reply = json.loads(await reader.readline())
+        if not reply.get("ok"):
+            writer.close()
+            raise BankError(f"cannot open load-test accounts: {reply.get('message')}")
+        if first is None:
+            first = reply["first"]
+    writer.close()
 
-    def view_balance(self):
-        """Display current account balance."""
-        print(f"💰 {self.owner}, your current balance is: ${self.balance:.2f}")
+    latencies: List[float] = []
+    outcomes: Dict[str, int] = {}
+    start = time.perf_counter()
+    await asyncio.gather(*(_load_client(host, port, first, accounts, requests, window, seed, latencies, outcomes)
+                           for seed in range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+
+    def pct(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+    print(f"{len(latencies):,} requests from {clients} clients (window {window}) in {elapsed:.2f}s: "
+          f"{len(latencies) / elapsed:,.0f} req/s")
+    print(f"latency p50 {pct(0.50):.2f} ms   p99 {pct(0.99):.2f} ms   max {latencies[-1] * 1000:.2f} ms")
+    print("outcomes: " + ", ".join(f"{k} {v:,}" for k, v in sorted(outcomes.items())))
+
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b'{"id": 0, "op": "metrics"}\n')
+    stats = json.loads(await reader.readline())["metrics"]
+    writer.close()
+    service = stats["service"]
+    execute = stats["latency_ms"].get("execute", {})
+    print(f"server: {service['requests']:,} requests in {service['batches']:,} batches; "
+          f"execute p50 {execute.get('p50', 0):.2f} ms p99 {execute.get('p99', 0):.2f} ms; "
+          f"{stats.get('log', {}).get('fsyncs', 0):,} fsyncs")
+
+
+def load_test(host: str, port: int, clients: int, requests: int, accounts: int, window: int,
+              spawn: bool = False) -> None:
+    """Drive a running service (or, with spawn, a fresh one on a temp directory)."""
+    import shutil
+    import socket
+    import subprocess
+    import tempfile
+
+    server, data_dir = None, None
+    if spawn:
+        with socket.socket() as probe:
+            probe.bind((host, 0))
+            port = probe.getsockname()[1]
+        data_dir = tempfile.mkdtemp(prefix="bank-service-")
+        server = subprocess.Popen([sys.executable, os.path.abspath(__file__), "serve", "--host", host,
+                                   "--port", str(port), "--data", data_dir], stdout=subprocess.DEVNULL)
+        for _ in range(100):
+            try:
+                socket.create_connection((host, port), timeout=0.1).close()
+                break
+            except OSError:
+                time.sleep(0.05)
+    try:
+        asyncio.run(_run_load(host, port, clients, requests, accounts, window))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+            shutil.rmtree(data_dir, ignore_errors=True)
 
 
 def main():
@@ -54,19 +1257,20 @@ def main():
         choice = input("Select an option (1-4): ")
 
         if choice == "1":
-            account.view_balance()
-        elif choice == "2":
+            print(f"💰 {account.owner}, your current balance is: {format_amount(account.view_balance())}")
+        elif choice in ("2", "3"):
+            verb = "deposit" if choice == "2" else "withdraw"
             try:
-                amount = float(input("Enter amount to deposit: "))
-                account.deposit(amount)
-            except ValueError:
-                print("❌ Please enter a valid number.")
-        elif choice == "3":
+                amount = _read_amount(f"Enter amount to {verb}: ")
+            except ValueError as e:
+                print(f"❌ Please enter a valid amount ({e}).")
+                continue
             try:
-                amount = float(input("Enter amount to withdraw: "))
-                account.withdraw(amount)
-            except ValueError:
-                print("❌ Please enter a valid number.")
+                receipt = account.deposit(amount) if choice == "2" else account.withdraw(amount)
+            except BankError as e:
+                print(f"❌ {e}")
+                continue
+            print(show_receipt(receipt))
         elif choice == "4":
             print("👋 Thank you for using SimpleBank. Goodbye!")
             break
@@ -74,5 +1278,48 @@ def main():
             print("❌ Invalid option. Please choose again.")
 
 
+def cli(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="banking_program", description="SimpleBank")
+    sub = parser.add_subparsers(dest="command")
+    p = sub.add_parser("bench", help="concurrent transfer benchmark")
+    p.add_argument("--accounts", type=int, default=1_000_000)
+    p.add_argument("--threads", type=int, default=8)
+    p.add_argument("--transactions", type=int, default=400_000)
+    p = sub.add_parser("bench-wal", help="commit throughput of the write-ahead log")
+    p.add_argument("--transactions", type=int, default=20_000)
+    p.add_argument("--threads", type=int, default=16)
+    p = sub.add_parser("serve", help="run the JSON-over-TCP service")
+    p.add_argument("--host", default=SERVICE_HOST)
+    p.add_argument("--port", type=int, default=SERVICE_PORT)
+    p.add_argument("--data", help="data directory for the log and snapshots (default: in memory)")
+    p.add_argument("--sync", choices=WriteAheadLog.SYNC_MODES, default="group")
+    p = sub.add_parser("loadgen", help="load-test a running service")
+    p.add_argument("--host", default=SERVICE_HOST)
+    p.add_argument("--port", type=int, default=SERVICE_PORT)
+    p.add_argument("--clients", type=int, default=50)
+    p.add_argument("--requests", type=int, default=2_000, help="per client")
+    p.add_argument("--accounts", type=int, default=1_000)
+    p.add_argument("--window", type=int, default=8, help="requests in flight per client")
+    p.add_argument("--spawn", action="store_true", help="start a throwaway server to test against")
+    p = sub.add_parser("verify", help="replay random transactions and check exact totals")
+    p.add_argument("--transactions", type=int, default=10_000_000)
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        bench_bank(args.accounts, args.threads, args.transactions)
+        bench_money()
+    elif args.command == "bench-wal":
+        bench_wal(args.transactions, args.threads)
+    elif args.command == "serve":
+        serve(args.data, args.host, args.port, args.sync)
+    elif args.command == "loadgen":
+        load_test(args.host, args.port, args.clients, args.requests, args.accounts, args.window, args.spawn)
+    elif args.command == "verify":
+        return 0 if verify_replay(args.transactions) else 1
+    else:
+        main()
+    return 0
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(cli())
@@ -3,10 +3,411 @@ Caesar Cipher Encryption/Decryption
 -----------------------------------
 This program encrypts or decrypts text using the Caesar Cipher method.
 Each letter is shifted by a given number of positions.
+
+Text is translated in one pass with str.translate / bytes.translate using
+tables cached per shift (plus an optional NumPy path for byte buffers),
+instead of building the result character by character.
+
+Files and pipes are processed as bytes in fixed-size chunks:
+    python caesar_cipher.py encrypt --shift 3 in.txt out.txt
+    some_command | python caesar_cipher.py decrypt --shift 3
+Large files are memory-mapped and split across a process pool.
+
+crack() recovers an unknown shift by chi-squared scoring against English
+letter frequencies:
+    python caesar_cipher.py crack secret.txt
+
+The same table machinery drives a small cipher engine: substitution and
+affine ciphers (one table each) and Vigenère (one table per key letter,
+applied to strided slices), over any Alphabet of equal-length case rings:
+    VigenereCipher("lemon").encrypt("Attack at dawn")
+    affine(5, 8, GREEK).encrypt("καλημέρα")
 """
 
-def encrypt(text: str, shift: int) -> str:
-    """Encrypt the text with Caesar Cipher."""
+import argparse
+import mmap
+import os
+import re
+import string
+import sys
+import time
+from collections import Counter
+from contextlib import ExitStack
+from functools import lru_cache
+from itertools import zip_longest
+from math import gcd
+from typing import BinaryIO, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+
+@lru_cache(maxsize=26)
+def _str_table(shift: int) -> dict:
+    """str.translate table for one shift (the 52 ASCII letters; grown by _cover)."""
+    lower, upper = string.ascii_lowercase, string.ascii_uppercase
+    return str.maketrans(lower + upper, lower[shift:] + lower[:shift] + upper[shift:] + upper[:shift])
+
+
+def _cover(table: dict, text: str, shift: int) -> None:
+    # The classic loop also shifted non-ASCII letters (isalpha() is Unicode
+    # aware), mapping them onto ASCII. Add the ones in `text` to the table so
+    # output stays identical; anything absent from the table is left as is.
+    for char in set(text):
+        code = ord(char)
+        if code > 127 and code not in table and char.isalpha():
+            shift_base = ord('A') if char.isupper() else ord('a')
+            table[code] = (code - shift_base + shift) % 26 + shift_base
+
+
+@lru_cache(maxsize=26)
+def _bytes_table(shift: int) -> bytes:
+    lower, upper = string.ascii_lowercase.encode(), string.ascii_uppercase.encode()
+    return bytes.maketrans(lower + upper, lower[shift:] + lower[:shift] + upper[shift:] + upper[:shift])
+
+
+def encrypt(text: Union[str, bytes], shift: int) -> Union[str, bytes]:
+    """Encrypt the text with Caesar Cipher.
+
+    bytes input is translated byte-wise: only ASCII letters shift, so
+    encoded non-ASCII letters pass through unchanged.
+    """
+    shift %= 26
+    if isinstance(text, (bytes, bytearray)):
+        return text.translate(_bytes_table(shift))
+    if text.isascii():
+        return text.encode("ascii").translate(_bytes_table(shift)).decode("ascii")
+    table = _str_table(shift)
+    _cover(table, text, shift)
+    return text.translate(table)
+
+
+def decrypt(cipher: Union[str, bytes], shift: int) -> Union[str, bytes]:
+    """Decrypt text encrypted with Caesar Cipher."""
+    return encrypt(cipher, -shift)
+
+
+def encrypt_array(data, shift: int):
+    """Shift ASCII letters in a uint8 NumPy array (or bytes) with one vectorised table lookup."""
+    if np is None:
+        raise RuntimeError("NumPy is not installed; use encrypt() on bytes instead")
+    table = np.frombuffer(_bytes_table(shift % 26), dtype=np.uint8)
+    arr = np.frombuffer(data, dtype=np.uint8) if isinstance(data, (bytes, bytearray, memoryview)) else data
+    return table[arr]
+
+
+CHUNK_SIZE = 4 * 2 ** 20
+PARALLEL_THRESHOLD = 64 * 2 ** 20  # files smaller than this are not worth a pool
+
+
+def encrypt_stream(src: BinaryIO, dst: BinaryIO, shift: int, chunk_size: int = CHUNK_SIZE) -> int:
+    """Encrypt a byte stream chunk by chunk with bounded memory; returns bytes written."""
+    table = _bytes_table(shift % 26)
+    total = 0
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            return total
+        dst.write(chunk.translate(table))
+        total += len(chunk)
+
+
+def _encrypt_range(args: Tuple[str, str, int, int, int]) -> int:
+    # worker: map just this slice of the input and write it in place in the output
+    in_path, out_path, shift, offset, length = args
+    table = _bytes_table(shift % 26)
+    with open(in_path, "rb") as src, open(out_path, "r+b") as dst:
+        with mmap.mmap(src.fileno(), length, access=mmap.ACCESS_READ, offset=offset) as view:
+            dst.seek(offset)
+            for start in range(0, length, CHUNK_SIZE):
+                dst.write(view[start:start + CHUNK_SIZE].translate(table))
+    return length
+
+
+def encrypt_file(in_path: str, out_path: str, shift: int, workers: Optional[int] = None,
+                 chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Encrypt a file as bytes (only ASCII letters shift). Small files stream
+    through one memory map; large ones are cut into ranges that a process
+    pool encrypts and writes straight to their offsets in the pre-sized
+    output. Returns the number of bytes processed.
+    """
+    if os.path.exists(out_path) and os.path.samefile(in_path, out_path):
+        raise ValueError("input and output must be different files")
+    size = os.path.getsize(in_path)
+    workers = workers or os.cpu_count() or 1
+    if size < PARALLEL_THRESHOLD or workers == 1:
+        with open(in_path, "rb") as src, open(out_path, "wb") as dst:
+            if size == 0:
+                return 0
+            with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                table = _bytes_table(shift % 26)
+                for start in range(0, size, chunk_size):
+                    dst.write(view[start:start + chunk_size].translate(table))
+        return size
+
+    import multiprocessing
+
+    with open(out_path, "wb") as dst:
+        dst.truncate(size)
+    # range boundaries must be multiples of the mmap granularity
+    step = max(chunk_size, size // (workers * 4))
+    step -= step % mmap.ALLOCATIONGRANULARITY
+    step = max(step, mmap.ALLOCATIONGRANULARITY)
+    jobs = [(in_path, out_path, shift, off, min(step, size - off)) for off in range(0, size, step)]
+    with multiprocessing.Pool(workers) as pool:
+        return sum(pool.imap_unordered(_encrypt_range, jobs))
+
+
+def decrypt_file(in_path: str, out_path: str, shift: int, workers: Optional[int] = None,
+                 chunk_size: int = CHUNK_SIZE) -> int:
+    return encrypt_file(in_path, out_path, -shift, workers, chunk_size)
+
+
+# Relative frequency (%) of a..z in English text.
+ENGLISH_FREQ = (
+    8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153, 0.772, 4.025, 2.406,
+    6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074,
+)
+SAMPLE_SIZE = 64 * 1024  # letters beyond this barely move the ranking
+SAMPLE_WINDOWS = 16
+
+
+class Candidate(NamedTuple):
+    shift: int    # pass to decrypt() to recover the plaintext
+    score: float  # chi-squared distance from English; lower is better
+
+
+def _sample(data: Union[bytes, mmap.mmap], size: int) -> bytes:
+    # evenly spaced windows, so one odd header or table doesn't dominate
+    if len(data) <= size:
+        return bytes(data)
+    window = size // SAMPLE_WINDOWS
+    stride = (len(data) - window) // (SAMPLE_WINDOWS - 1)
+    return b"".join(data[i * stride:i * stride + window] for i in range(SAMPLE_WINDOWS))
+
+
+def letter_counts(data: bytes) -> List[int]:
+    """Occurrences of each ASCII letter (case-folded) in one counting pass."""
+    if np is not None:
+        counts = np.bincount(np.frombuffer(data.lower(), dtype=np.uint8), minlength=256)
+        return counts[ord('a'):ord('z') + 1].tolist()
+    counts = Counter(data.lower())
+    return [counts.get(code, 0) for code in range(ord('a'), ord('z') + 1)]
+
+
+def crack(cipher: Union[str, bytes], top: int = 26, sample_size: int = SAMPLE_SIZE) -> List[Candidate]:
+    """
+    Rank the 26 possible shifts for `cipher`, most English-like first.
+
+    Letters are counted once; each shift is then scored by rotating the
+    26 counts, never by decrypting the text. Inputs longer than
+    `sample_size` are sampled.
+    """
+    data = cipher.encode("utf-8") if isinstance(cipher, str) else cipher
+    counts = letter_counts(_sample(data, sample_size))
+    total = sum(counts)
+    if total == 0:
+        return [Candidate(shift, 0.0) for shift in range(min(top, 26))]
+    expected = [total * f / 100 for f in ENGLISH_FREQ]
+    ranked = []
+    for shift in range(26):
+        # plaintext letter i shows up in the ciphertext as letter i + shift
+        score = sum((counts[(i + shift) % 26] - e) ** 2 / e for i, e in enumerate(expected))
+        ranked.append(Candidate(shift, score))
+    ranked.sort(key=lambda c: c.score)
+    return ranked[:top]
+
+
+def crack_file(path: str, top: int = 26, sample_size: int = SAMPLE_SIZE) -> List[Candidate]:
+    """crack() for a file, reading only the sampled windows through a memory map."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return crack(b"", top)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            return crack(_sample(view, sample_size), top, sample_size)
+
+
+class Alphabet:
+    """
+    The letters a cipher acts on: one or more rings of equal length (e.g.
+    lower and upper case). A cipher permutes positions 0..size-1 and every
+    ring is permuted the same way, so case survives encryption.
+    """
+
+    def __init__(self, *cases: str):
+        if not cases or len({len(c) for c in cases}) != 1 or not cases[0]:
+            raise ValueError("an alphabet needs one or more non-empty rings of equal length")
+        letters = "".join(cases)
+        if len(set(letters)) != len(letters):
+            raise ValueError("alphabet letters must be unique")
+        self.cases = cases
+        self.size = len(cases[0])
+        self.letters = letters
+        self.ascii = letters.isascii()
+        self._position = {c: i for ring in cases for i, c in enumerate(ring)}
+        self._runs = re.compile("([" + re.escape(letters) + "]+)")
+        self._bytes_runs = re.compile(self._runs.pattern.encode()) if self.ascii else None
+        self._tables: Dict[Tuple[Tuple[int, ...], bool], Union[dict, bytes]] = {}
+
+    def position(self, char: str) -> int:
+        try:
+            return self._position[char]
+        except KeyError:
+            raise ValueError(f"{char!r} is not in the alphabet") from None
+
+    def table(self, perm: Tuple[int, ...], as_bytes: bool = False) -> Union[dict, bytes]:
+        """Cached translate table mapping position i to perm[i] in every ring."""
+        key = (perm, as_bytes)
+        table = self._tables.get(key)
+        if table is None:
+            src = self.letters
+            dst = "".join(ring[j] for ring in self.cases for j in perm)
+            if as_bytes:
+                if not self.ascii:
+                    raise ValueError("bytes input needs an ASCII alphabet")
+                table = bytes.maketrans(src.encode(), dst.encode())
+            else:
+                table = str.maketrans(src, dst)
+            self._tables[key] = table
+        return table
+
+    def split(self, text: Union[str, bytes]) -> list:
+        """[other, letters, other, ..., other] runs of `text`."""
+        if isinstance(text, str):
+            return self._runs.split(text)
+        if self._bytes_runs is None:
+            raise ValueError("bytes input needs an ASCII alphabet")
+        return self._bytes_runs.split(text)
+
+
+ASCII = Alphabet(string.ascii_lowercase, string.ascii_uppercase)
+GREEK = Alphabet("αβγδεζηθικλμνξοπρστυφχψω", "ΑΒΓΔΕΖΗΘΙΚΛΜΝΞΟΠΡΣΤΥΦΧΨΩ")
+CYRILLIC = Alphabet("абвгдеёжзийклмнопрстуфхцчшщъыьэюя", "АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ")
+
+
+def _shift_perm(shift: int, size: int) -> Tuple[int, ...]:
+    return tuple((i + shift) % size for i in range(size))
+
+
+class SubstitutionCipher:
+    """Any one-to-one replacement of alphabet positions; one table lookup per character."""
+
+    def __init__(self, perm: Sequence[int], alphabet: Alphabet = ASCII):
+        perm = tuple(perm)
+        if sorted(perm) != list(range(alphabet.size)):
+            raise ValueError(f"substitution must be a permutation of 0..{alphabet.size - 1}")
+        self.alphabet = alphabet
+        self.perm = perm
+        inverse = [0] * len(perm)
+        for i, j in enumerate(perm):
+            inverse[j] = i
+        self.inverse = tuple(inverse)
+
+    @classmethod
+    def from_key(cls, key: str, alphabet: Alphabet = ASCII) -> "SubstitutionCipher":
+        """Key is the cipher alphabet written out in any one case, e.g. 'QWERTYUIOPASDFGHJKLZXCVBNM'."""
+        return cls([alphabet.position(c) for c in key], alphabet)
+
+    def _apply(self, text, perm):
+        if isinstance(text, (bytes, bytearray)):
+            return text.translate(self.alphabet.table(perm, as_bytes=True))
+        if self.alphabet.ascii and text.isascii():
+            return text.encode("ascii").translate(self.alphabet.table(perm, as_bytes=True)).decode("ascii")
+        return text.translate(self.alphabet.table(perm))
+
+    def encrypt(self, text: Union[str, bytes]) -> Union[str, bytes]:
+        return self._apply(text, self.perm)
+
+    def decrypt(self, cipher: Union[str, bytes]) -> Union[str, bytes]:
+        return self._apply(cipher, self.inverse)
+
+
+def affine(a: int, b: int, alphabet: Alphabet = ASCII) -> SubstitutionCipher:
+    """E(x) = (a*x + b) mod size; `a` must be coprime with the alphabet size."""
+    if gcd(a, alphabet.size) != 1:
+        raise ValueError(f"a={a} is not coprime with alphabet size {alphabet.size}")
+    return SubstitutionCipher([(a * i + b) % alphabet.size for i in range(alphabet.size)], alphabet)
+
+
+def caesar(shift: int, alphabet: Alphabet = ASCII) -> SubstitutionCipher:
+    return SubstitutionCipher(_shift_perm(shift, alphabet.size), alphabet)
+
+
+class VigenereCipher:
+    """
+    Per-position shifts taken from a repeating key; the key advances on
+    letters only. Letters are gathered out of the text, slice i::len(key)
+    goes through the table for key letter i, and the results are put back
+    between the untouched runs, so no Python code runs per character.
+    """
+
+    def __init__(self, key: Union[str, Sequence[int]], alphabet: Alphabet = ASCII):
+        shifts = [alphabet.position(c) for c in key] if isinstance(key, str) else list(key)
+        if not shifts:
+            raise ValueError("key must not be empty")
+        self.alphabet = alphabet
+        self.shifts = tuple(s % alphabet.size for s in shifts)
+
+    def encrypt(self, text: Union[str, bytes]) -> Union[str, bytes]:
+        return self._apply(text, self.shifts)
+
+    def decrypt(self, cipher: Union[str, bytes]) -> Union[str, bytes]:
+        return self._apply(cipher, tuple(-s % self.alphabet.size for s in self.shifts))
+
+    def _apply(self, text, shifts):
+        if np is not None:
+            return self._apply_numpy(text, shifts)
+        alphabet, m = self.alphabet, len(shifts)
+        as_bytes = isinstance(text, (bytes, bytearray))
+        runs = alphabet.split(text)
+        letters = text[:0].join(runs[1::2])
+        tables = [alphabet.table(_shift_perm(s, alphabet.size), as_bytes) for s in shifts]
+        if as_bytes:
+            out = bytearray(len(letters))
+            for i, table in enumerate(tables):
+                out[i::m] = letters[i::m].translate(table)
+            shifted = bytes(out)
+        else:
+            parts = [letters[i::m].translate(table) for i, table in enumerate(tables)]
+            shifted = "".join(map("".join, zip_longest(*parts, fillvalue="")))
+        pos = 0
+        for i in range(1, len(runs), 2):
+            end = pos + len(runs[i])
+            runs[i] = shifted[pos:end]
+            pos = end
+        return text[:0].join(runs)
+
+    def _apply_numpy(self, text, shifts):
+        # bytes as uint8, str as UTF-32 code points; letters are found by
+        # binary search in the sorted alphabet, shifted with one gather
+        alphabet = self.alphabet
+        if isinstance(text, (bytes, bytearray)):
+            if not alphabet.ascii:
+                raise ValueError("bytes input needs an ASCII alphabet")
+            codes = np.frombuffer(text, dtype=np.uint8)
+        else:
+            codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+        letters = np.array([ord(c) for c in alphabet.letters], dtype=np.int64)
+        order = np.argsort(letters)
+        found = np.searchsorted(letters[order], codes).clip(0, len(letters) - 1)
+        slot = order[found]
+        is_letter = letters[slot] == codes
+        slot = slot[is_letter]
+        ring, pos = np.divmod(slot, alphabet.size)
+        key = np.array(shifts, dtype=np.int64)
+        pos = (pos + key[np.arange(len(slot)) % len(key)]) % alphabet.size
+        out = codes.copy()
+        out[is_letter] = letters[ring * alphabet.size + pos]
+        if isinstance(text, (bytes, bytearray)):
+            return out.tobytes()
+        return out.tobytes().decode("utf-32-le")
+
+
+def encrypt_loop(text: str, shift: int) -> str:
+    """Character-by-character reference implementation (slow; kept for checks)."""
     result = ""
     for char in text:
         if char.isalpha():
@@ -17,9 +418,101 @@ def encrypt(text: str, shift: int) -> str:
     return result
 
 
-def decrypt(cipher: str, shift: int) -> str:
-    """Decrypt text encrypted with Caesar Cipher."""
-    return encrypt(cipher, -shift)
+def bench(size_mb: int = 16) -> None:
+    """Throughput (MB/s) of the reference loop vs the str / bytes / NumPy fast paths."""
+    sample = "2025-08-17 12:00:01 INFO The quick brown fox jumps over the lazy dog id=0123456789\n"
+    text = sample * (size_mb * 2 ** 20 // len(sample))
+    accented = text.replace("quick", "qüïck")
+    data = text.encode()
+
+    def rate(fn, arg) -> float:
+        start = time.perf_counter()
+        fn(arg, 3)
+        return len(arg) / 2 ** 20 / (time.perf_counter() - start)
+
+    print(f"loop           {rate(encrypt_loop, text[:len(text) // 64]):10.1f} MB/s")
+    print(f"str (ASCII)    {rate(encrypt, text):10.1f} MB/s")
+    print(f"str (Unicode)  {rate(encrypt, accented):10.1f} MB/s")
+    print(f"bytes          {rate(encrypt, data):10.1f} MB/s")
+    if np is not None:
+        print(f"numpy          {rate(encrypt_array, data):10.1f} MB/s")
+
+
+def bench_file(size_mb: int = 256) -> None:
+    """File throughput with one process vs the whole pool."""
+    import tempfile
+
+    line = b"2025-08-17 12:00:01 INFO The quick brown fox jumps over the lazy dog id=0123456789\n"
+    with tempfile.TemporaryDirectory() as tmp:
+        src, dst = os.path.join(tmp, "in.log"), os.path.join(tmp, "out.log")
+        with open(src, "wb") as f:
+            block = line * (2 ** 20 // len(line))
+            for _ in range(size_mb):
+                f.write(block)
+        size = os.path.getsize(src) / 2 ** 20
+        for workers in sorted({1, os.cpu_count() or 1}):
+            start = time.perf_counter()
+            encrypt_file(src, dst, 3, workers=workers)
+            print(f"file, {workers} worker(s): {size / (time.perf_counter() - start):8.1f} MB/s")
+
+
+_ENGLISH = (
+    "It was the best of times, it was the worst of times, it was the age of wisdom, it was the "
+    "age of foolishness, it was the epoch of belief, it was the epoch of incredulity, it was the "
+    "season of Light, it was the season of Darkness, it was the spring of hope, it was the winter "
+    "of despair, we had everything before us, we had nothing before us, we were all going direct "
+    "to Heaven, we were all going direct the other way. There were a king with a large jaw and a "
+    "queen with a plain face, on the throne of England; there were a king with a large jaw and a "
+    "queen with a fair face, on the throne of France. In both countries it was clearer than "
+    "crystal to the lords of the State preserves of loaves and fishes, that things in general "
+    "were settled for ever. "
+)
+
+
+def bench_crack(trials: int = 500, seed: int = 1) -> None:
+    """Top-1 accuracy by message length, then speed against trying all 26 decryptions."""
+    import random
+
+    rng = random.Random(seed)
+    text = _ENGLISH * 4
+    for length in (10, 20, 40, 80, 160, 320):
+        hits = 0
+        for _ in range(trials):
+            start = rng.randrange(len(text) - length)
+            plain, shift = text[start:start + length], rng.randrange(26)
+            hits += crack(encrypt(plain, shift), top=1)[0].shift == shift
+        print(f"{length:4d} chars: {hits / trials:7.1%} top-1")
+
+    big = encrypt((_ENGLISH * (2 ** 24 // len(_ENGLISH))).encode(), 11)
+    for label, fn in (
+        ("crack (sampled)", lambda: crack(big)),
+        ("crack (full count)", lambda: crack(big, sample_size=len(big))),
+        ("26 decryptions", lambda: [letter_counts(decrypt(big, s)) for s in range(26)]),
+    ):
+        start = time.perf_counter()
+        fn()
+        print(f"{label:19s} {len(big) / 2 ** 20:.0f} MB: {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+
+def bench_engine(size_mb: int = 16) -> None:
+    """Engine throughput next to the single-shift encrypt() fast path."""
+    text = (_ENGLISH * (size_mb * 2 ** 20 // len(_ENGLISH)))
+    data = text.encode()
+    greek = text.translate(str.maketrans(ASCII.letters, (GREEK.cases[0] * 3)[:len(ASCII.letters)]))
+    vigenere = VigenereCipher("lemon")
+
+    def rate(fn, arg) -> float:
+        start = time.perf_counter()
+        fn(arg)
+        return len(arg) / 2 ** 20 / (time.perf_counter() - start)
+
+    print(f"caesar encrypt() str     {rate(lambda t: encrypt(t, 3), text):8.1f} MB/s")
+    print(f"affine str               {rate(affine(5, 8).encrypt, text):8.1f} MB/s")
+    print(f"affine bytes             {rate(affine(5, 8).encrypt, data):8.1f} MB/s")
+    print(f"affine Greek str         {rate(affine(5, 8, GREEK).encrypt, greek):8.1f} Mchar/s")
+    print(f"vigenere str             {rate(vigenere.encrypt, text):8.1f} MB/s")
+    print(f"vigenere bytes           {rate(vigenere.encrypt, data):8.1f} MB/s")
+    print(f"vigenere Greek str       {rate(VigenereCipher('κλειδι', GREEK).encrypt, greek):8.1f} Mchar/s")
 
 
 def main():
@@ -46,5 +539,65 @@ def main():
         print(f"🔓 Decrypted message: {decrypted}")
 
 
+def cli(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="caesar", description="Caesar cipher")
+    sub = parser.add_subparsers(dest="command")
+    for name in ("encrypt", "decrypt"):
+        p = sub.add_parser(name, help=f"{name} a file or stdin (as bytes)")
+        p.add_argument("--shift", type=int, required=True)
+        p.add_argument("input", nargs="?", default="-", help="input file ('-' or omitted: stdin)")
+        p.add_argument("output", nargs="?", default="-", help="output file ('-' or omitted: stdout)")
+        p.add_argument("--workers", type=int, help="processes for large files (default: CPU count)")
+        p.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    p = sub.add_parser("crack", help="guess the shift of a file or stdin")
+    p.add_argument("input", nargs="?", default="-")
+    p.add_argument("--top", type=int, default=3, help="candidates to show")
+    sub.add_parser("bench", help="throughput benchmarks")
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        main()
+        return 0
+    if args.command == "bench":
+        bench()
+        bench_file()
+        bench_crack()
+        bench_engine()
+        return 0
+    if args.command == "crack":
+        try:
+            if args.input == "-":
+                data = sys.stdin.buffer.read()
+                ranked = crack(data, args.top)
+            else:
+                with open(args.input, "rb") as f:
+                    data = f.read(200)
+                ranked = crack_file(args.input, args.top)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+        for cand in ranked:
+            preview = decrypt(data[:60], cand.shift).decode("utf-8", "replace").replace("\n", " ")
+            print(f"shift {cand.shift:2d}  chi² {cand.score:10.1f}  {preview}")
+        return 0
+    shift = args.shift if args.command == "encrypt" else -args.shift
+    if args.input != "-" and args.output != "-":
+        try:
+            encrypt_file(args.input, args.output, shift, args.workers, args.chunk_size)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+        return 0
+    try:
+        with ExitStack() as stack:
+            src = sys.stdin.buffer if args.input == "-" else stack.enter_context(open(args.input, "rb"))
+            dst = sys.stdout.buffer if args.output == "-" else stack.enter_context(open(args.output, "wb"))
+            encrypt_stream(src, dst, shift, args.chunk_size)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(cli())
@@ -4,11 +4,47 @@ Calculator Program (CLI)
 Operations:
 - Addition, Subtraction, Multiplication, Division (with zero handling)
 - Power (x^y), Square Root, Percentage
-- History of last results (in-memory)
+- Expressions with precedence, parentheses and variables, e.g.
+  `r = 2.5`, `3.14159 * r^2`, `sqrt(ans) + 15%`
+- Batch mode over arrays or CSV columns:
+  `python calculator.py batch divide data.csv --a total --b count`
+- History of calculations: a bounded ring buffer persisted to
+  calculator_history.jsonl, with paging and O(1) sum/mean/min/max
+
+Expressions are parsed once and compiled to nested closures; compiled
+forms are kept in an LRU cache so re-evaluating an expression costs only
+the arithmetic.
 """
 
+import argparse
+import csv
+import json
 import math
-from typing import List, Callable, Tuple
+import os
+import operator
+import re
+import sys
+import time
+from collections import deque
+from fractions import Fraction
+from functools import lru_cache
+from itertools import islice, repeat
+from typing import Deque, Dict, Iterator, List, Callable, NamedTuple, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; batch mode falls back to plain lists
+    np = None
+
+HISTORY_FILE = "calculator_history.jsonl"
+HISTORY_SIZE = 1000
+PAGE_SIZE = 10
+
+
+class HistoryEntry(NamedTuple):
+    expression: str
+    operands: Tuple[float, ...]
+    result: float
 
 
 def read_float(prompt: str) -> float:
@@ -20,29 +56,35 @@ def read_float(prompt: str) -> float:
             print("❌ Invalid number. Try again.")
 
 
-def binary_op(op_name: str, func: Callable[[float, float], float]) -> float:
-    """Handle binary operations (need two numbers)."""
-    a = read_float("Enter first number: ")
-    b = read_float("Enter second number: ")
+def binary_op(op_name: str, func: Callable[[float, float], float], template: str,
+              prompts: Tuple[str, str] = ("Enter first number: ", "Enter second number: ")) -> HistoryEntry:
+    """Handle binary operations (need two numbers); `template` spells the calculation for history."""
+    a = read_float(prompts[0])
+    b = read_float(prompts[1])
+    expression = template.format(a=a, b=b)
     try:
         result = func(a, b)
     except ZeroDivisionError:
         print("❌ Division by zero is not allowed.")
-        return math.nan
+        return HistoryEntry(expression, (a, b), math.nan)
+    except (ValueError, OverflowError):
+        print("❌ Domain error (e.g., fractional power of a negative).")
+        return HistoryEntry(expression, (a, b), math.nan)
     print(f"✅ {op_name} result: {result}")
-    return result
+    return HistoryEntry(expression, (a, b), result)
 
 
-def unary_op(op_name: str, func: Callable[[float], float]) -> float:
+def unary_op(op_name: str, func: Callable[[float], float], name: str) -> HistoryEntry:
     """Handle unary operations (need one number)."""
     x = read_float("Enter number: ")
+    expression = f"{name}({x})"
     try:
         result = func(x)
     except ValueError:
         print("❌ Domain error (e.g., sqrt of negative).")
-        return math.nan
+        return HistoryEntry(expression, (x,), math.nan)
     print(f"✅ {op_name} result: {result}")
-    return result
+    return HistoryEntry(expression, (x,), result)
 
 
 def percentage(base: float, pct: float) -> float:
@@ -50,21 +92,724 @@ def percentage(base: float, pct: float) -> float:
     return (pct / 100.0) * base
 
 
-def menu() -> None:
-    history: List[float] = []
-
-    actions: List[Tuple[str, Callable[[], float]]] = [
-        ("Add", lambda: binary_op("Addition", lambda x, y: x + y)),
-        ("Subtract", lambda: binary_op("Subtraction", lambda x, y: x - y)),
-        ("Multiply", lambda: binary_op("Multiplication", lambda x, y: x * y)),
-        ("Divide", lambda: binary_op("Division", lambda x, y: x / y)),
-        ("Power (x^y)", lambda: binary_op("Power", lambda x, y: x ** y)),
-        ("Square Root", lambda: unary_op("Square Root", math.sqrt)),
-        ("Percentage (pct% of base)", lambda: (
-            lambda base, pct: print(f"✅ Percentage result: {percentage(base, pct)}") or percentage(base, pct)
-        )(
-            read_float("Base: "), read_float("Percent (%): ")
+def power(x: float, y: float) -> float:
+    """x ** y as a float; 0 to a negative power is a division by zero, as in the menu."""
+    if x == 0 and y < 0:
+        raise ZeroDivisionError("0.0 cannot be raised to a negative power")
+    return math.pow(x, y)
+
+
+class ExpressionError(ValueError):
+    """Raised for malformed expressions and unknown names."""
+
+
+TOKEN_RE = re.compile(r"\s*(?:(\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)|([A-Za-z_]\w*)|(\*\*|[-+*/^%(),=]))")
+
+# name -> (function, number of arguments)
+FUNCTIONS: Dict[str, Tuple[Callable[..., float], int]] = {
+    "sqrt": (math.sqrt, 1),
+    "percentage": (percentage, 2),
+    "abs": (abs, 1),
+}
+CONSTANTS: Dict[str, float] = {"pi": math.pi, "e": math.e}
+BINARY_OPS: Dict[str, Callable[[float, float], float]] = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "^": power,  # like x ** y, but a domain error instead of a complex result
+}
+
+
+def tokenize(text: str) -> List[Tuple[str, object]]:
+    tokens = []
+    pos, end = 0, len(text.rstrip())
+    while pos < end:
+        m = TOKEN_RE.match(text, pos)
+        if not m:
+            pos += len(text[pos:]) - len(text[pos:].lstrip())
+            raise ExpressionError(f"unexpected character {text[pos]!r} at position {pos + 1}")
+        number, name, op = m.groups()
+        if number is not None:
+            tokens.append(("num", float(number)))
+        elif name is not None:
+            tokens.append(("name", name))
+        else:
+            tokens.append(("op", "^" if op == "**" else op))
+        pos = m.end()
+    tokens.append(("end", None))
+    return tokens
+
+
+class _Parser:
+    """
+    Recursive descent over the token list, producing a tuple AST:
+    ("num", v) ("var", name) ("neg", x) ("bin", op, a, b) ("call", name, args)
+
+        expr    := term (("+" | "-") term)*
+        term    := unary (("*" | "/") unary)*
+        unary   := ("-" | "+") unary | power
+        power   := postfix ("^" unary)?          right-associative
+        postfix := atom "%"*                      x% == x / 100
+        atom    := number | name | name "(" args ")" | "(" expr ")"
+    """
+
+    def __init__(self, text: str):
+        self.tokens = tokenize(text)
+        self.pos = 0
+
+    def peek(self, value=None) -> bool:
+        kind, val = self.tokens[self.pos]
+        return kind == "op" and val == value
+
+    def take(self):
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def expect(self, value: str) -> None:
+        if not self.peek(value):
+            raise ExpressionError(f"expected {value!r}")
+        self.pos += 1
+
+    def statement(self) -> Tuple[Optional[str], tuple]:
+        target = None
+        if self.tokens[self.pos][0] == "name" and self.tokens[self.pos + 1] == ("op", "="):
+            target = self.take()[1]
+            if target in CONSTANTS or target in FUNCTIONS:
+                raise ExpressionError(f"cannot assign to {target!r}")
+            self.pos += 1
+        node = self.expr()
+        if self.tokens[self.pos][0] != "end":
+            raise ExpressionError(f"unexpected {self.tokens[self.pos][1]!r}")
+        return target, node
+
+    def expr(self) -> tuple:
+        node = self.term()
+        while self.peek("+") or self.peek("-"):
+            node = ("bin", self.take()[1], node, self.term())
+        return node
+
+    def term(self) -> tuple:
+        node = self.unary()
+        while self.peek("*") or self.peek("/"):
+            node = ("bin", self.take()[1], node, self.unary())
+        return node
+
+    def unary(self) -> tuple:
+        if self.peek("-"):
+            self.pos += 1
+            return ("neg", self.unary())
+        if self.peek("+"):
+            self.pos += 1
+            return self.unary()
+        return self.power()
+
+    def power(self) -> tuple:
+        node = self.postfix()
+        if self.peek("^"):
+            self.pos += 1
+            node = ("bin", "^", node, self.unary())
+        return node
+
+    def postfix(self) -> tuple:
+        node = self.atom()
+        while self.peek("%"):
+            self.pos += 1
+            node = ("bin", "/", node, ("num", 100.0))
+        return node
+
+    def atom(self) -> tuple:
+        kind, val = self.take()
+        if kind == "num":
+            return ("num", val)
+        if kind == "name":
+            if not self.peek("("):
+                return ("num", CONSTANTS[val]) if val in CONSTANTS else ("var", val)
+            if val not in FUNCTIONS:
+                raise ExpressionError(f"unknown function {val!r}")
+            self.pos += 1
+            args = []
+            if not self.peek(")"):
+                args.append(self.expr())
+                while self.peek(","):
+                    self.pos += 1
+                    args.append(self.expr())
+            self.expect(")")
+            arity = FUNCTIONS[val][1]
+            if len(args) != arity:
+                raise ExpressionError(f"{val}() takes {arity} argument{'s' if arity != 1 else ''}, "
+                                      f"got {len(args)}")
+            return ("call", val, tuple(args))
+        if kind == "op" and val == "(":
+            node = self.expr()
+            self.expect(")")
+            return node
+        raise ExpressionError("unexpected end of expression" if kind == "end" else f"unexpected {val!r}")
+
+
+def _fold(node: tuple) -> tuple:
+    """Evaluate constant sub-trees at compile time (errors are left for run time)."""
+    kind = node[0]
+    if kind == "neg":
+        inner = _fold(node[1])
+        return ("num", -inner[1]) if inner[0] == "num" else ("neg", inner)
+    if kind == "bin":
+        a, b = _fold(node[2]), _fold(node[3])
+        if a[0] == "num" and b[0] == "num":
+            try:
+                return ("num", BINARY_OPS[node[1]](a[1], b[1]))
+            except (ArithmeticError, ValueError):
+                pass
+        return ("bin", node[1], a, b)
+    if kind == "call":
+        return ("call", node[1], tuple(_fold(arg) for arg in node[2]))
+    return node
+
+
+def _compile(node: tuple) -> Callable[[Dict[str, float]], float]:
+    kind = node[0]
+    if kind == "num":
+        value = node[1]
+        return lambda env: value
+    if kind == "var":
+        name = node[1]
+        return lambda env: env[name]
+    if kind == "neg":
+        inner = _compile(node[1])
+        return lambda env: -inner(env)
+    if kind == "call":
+        func = FUNCTIONS[node[1]][0]
+        args = [_compile(arg) for arg in node[2]]
+        if len(args) == 1:
+            (arg,) = args
+            return lambda env: func(arg(env))
+        return lambda env: func(*[arg(env) for arg in args])
+    op = BINARY_OPS[node[1]]
+    left, right = node[2], node[3]
+    # specialise the common "something op constant" / "variable op ..." shapes
+    if right[0] == "num":
+        a, b = _compile(left), right[1]
+        return lambda env: op(a(env), b)
+    if left[0] == "num":
+        a, b = left[1], _compile(right)
+        return lambda env: op(a, b(env))
+    a, b = _compile(left), _compile(right)
+    return lambda env: op(a(env), b(env))
+
+
+def _names(node: tuple) -> set:
+    if node[0] == "var":
+        return {node[1]}
+    children = node[2] if node[0] == "call" else node[1:] if node[0] == "neg" else node[2:] if node[0] == "bin" else ()
+    return set().union(*map(_names, children)) if children else set()
+
+
+class CompiledExpression:
+    """A parsed, folded and compiled expression; call evaluate() as often as needed."""
+
+    __slots__ = ("source", "target", "names", "_func")
+
+    def __init__(self, source: str):
+        self.source = source
+        self.target, tree = _Parser(source).statement()
+        tree = _fold(tree)
+        self.names = frozenset(_names(tree))
+        self._func = _compile(tree)
+
+    def evaluate(self, variables: Optional[Dict[str, float]] = None) -> float:
+        """Result of the expression; an assignment also stores it in `variables`."""
+        env = variables if variables is not None else {}
+        try:
+            result = self._func(env)
+        except KeyError as e:
+            raise ExpressionError(f"unknown variable {e.args[0]!r}") from None
+        if self.target is not None:
+            env[self.target] = result
+        return result
+
+
+@lru_cache(maxsize=256)
+def compile_expression(source: str) -> CompiledExpression:
+    """Parse and compile `source`, reusing the cached result for repeated text."""
+    return CompiledExpression(source.strip())
+
+
+def evaluate(source: str, variables: Optional[Dict[str, float]] = None) -> float:
+    return compile_expression(source).evaluate(variables)
+
+
+def expression_op(variables: Dict[str, float], history: "History") -> HistoryEntry:
+    """Read an expression (or `name = expression`) and evaluate it."""
+    source = input("Expression: ").strip()
+    latest = history.latest()
+    variables["ans"] = latest.result if latest else 0.0
+    try:
+        expr = compile_expression(source)
+        operands = tuple(variables[name] for name in sorted(expr.names) if name in variables)
+        result = expr.evaluate(variables)
+    except ZeroDivisionError:
+        print("❌ Division by zero is not allowed.")
+        return HistoryEntry(source, (), math.nan)
+    except ExpressionError as e:
+        print(f"❌ {e}")
+        return HistoryEntry(source, (), math.nan)
+    except (ValueError, OverflowError):
+        print("❌ Domain error (e.g., sqrt of negative).")
+        return HistoryEntry(source, (), math.nan)
+    print(f"✅ Result: {result}")
+    return HistoryEntry(source, operands, result)
+
+
+def _add_exact(partials: List[float], x: float) -> None:
+    """
+    Add `x` to an exact sum kept as non-overlapping partials (Shewchuk's
+    algorithm, as behind math.fsum); adding -x undoes it exactly.
+    """
+    i = 0
+    for y in partials:
+        if abs(x) < abs(y):
+            x, y = y, x
+        hi = x + y
+        lo = y - (hi - x)
+        if lo:
+            partials[i] = lo
+            i += 1
+        x = hi
+    partials[i:] = [x]
+
+
+class History:
+    """
+    The last `capacity` calculations in a ring buffer.
+
+    Every entry is appended to a JSON-lines file as it is recorded; the file
+    is rewritten down to the live entries once it holds twice the capacity.
+    Sum and mean come from an exact running total (a handful of partials,
+    so a large result leaving the buffer takes nothing with it), min and
+    max from monotonic queues of (sequence, result), so all four are O(1)
+    however large the buffer is.
+    """
+
+    def __init__(self, capacity: int = HISTORY_SIZE, path: Optional[str] = None):
+        if capacity < 1:
+            raise ValueError("history capacity must be at least 1")
+        self.capacity = capacity
+        self.path = path
+        self._reset()
+        self._file = None
+        self._file_lines = 0
+        if path is not None:
+            self._load()
+            self._file = open(path, "a", encoding="utf-8")
+
+    def _reset(self) -> None:
+        self._ring: List[Optional[HistoryEntry]] = [None] * self.capacity
+        self._seq = 0               # entries ever recorded; the next one goes to _seq % capacity
+        self._partials: Optional[List[float]] = []  # None after an overflow: rebuilt on demand
+        self._nonfinite = 0         # inf results are kept out of the total so eviction can undo it
+        self._mins: Deque[Tuple[int, float]] = deque()
+        self._maxs: Deque[Tuple[int, float]] = deque()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                self._file_lines += 1
+                try:
+                    r = json.loads(line)
+                    entry = HistoryEntry(r["expression"], tuple(r["operands"]), r["result"])
+                except (ValueError, KeyError, TypeError):
+                    continue  # a torn last line after a crash
+                self._push(entry)
+
+    def _push(self, entry: HistoryEntry) -> None:
+        result, seq = entry.result, self._seq
+        if self._seq >= self.capacity:
+            old = self._ring[seq % self.capacity]
+            if math.isfinite(old.result):
+                self._add(-old.result)
+            else:
+                self._nonfinite -= 1
+            gone = seq - self.capacity
+            if self._mins[0][0] == gone:
+                self._mins.popleft()
+            if self._maxs[0][0] == gone:
+                self._maxs.popleft()
+        self._ring[seq % self.capacity] = entry
+        self._seq += 1
+        if math.isfinite(result):
+            self._add(result)
+        else:
+            self._nonfinite += 1
+        while self._mins and self._mins[-1][1] >= result:
+            self._mins.pop()
+        self._mins.append((seq, result))
+        while self._maxs and self._maxs[-1][1] <= result:
+            self._maxs.pop()
+        self._maxs.append((seq, result))
+
+    def _add(self, x: float) -> None:
+        if self._partials is not None:
+            _add_exact(self._partials, x)
+            if not math.isfinite(self._partials[-1]):
+                self._partials = None
+
+    def append(self, entry: HistoryEntry) -> None:
+        """Record a calculation (NaN results are not history)."""
+        if math.isnan(entry.result):
+            return
+        self._push(entry)
+        if self._file is not None:
+            self._file.write(json.dumps(entry._asdict()) + "\n")
+            self._file.flush()
+            self._file_lines += 1
+            if self._file_lines >= 2 * self.capacity:
+                self._compact()
+
+    def _compact(self) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for entry in self:
+                f.write(json.dumps(entry._asdict()) + "\n")
+        self._file.close()
+        os.replace(tmp, self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._file_lines = len(self)
+
+    def clear(self) -> None:
+        self._reset()
+        if self._file is not None:
+            self._file.truncate(0)
+            self._file_lines = 0
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __len__(self) -> int:
+        return min(self._seq, self.capacity)
+
+    def __iter__(self) -> Iterator[HistoryEntry]:
+        """Oldest first."""
+        start = self._seq - len(self)
+        return (self._ring[i % self.capacity] for i in range(start, self._seq))
+
+    def newest(self) -> Iterator[HistoryEntry]:
+        return (self._ring[i % self.capacity] for i in range(self._seq - 1, self._seq - len(self) - 1, -1))
+
+    def latest(self) -> Optional[HistoryEntry]:
+        return self._ring[(self._seq - 1) % self.capacity] if self._seq else None
+
+    def last(self, n: int) -> List[HistoryEntry]:
+        """The n most recent entries, newest first."""
+        return list(islice(self.newest(), max(n, 0)))
+
+    def page(self, number: int, size: int = PAGE_SIZE) -> List[HistoryEntry]:
+        """Page `number` (1-based) of the history, newest first."""
+        start = (number - 1) * size
+        return list(islice(self.newest(), max(start, 0), start + size))
+
+    @property
+    def sum(self) -> float:
+        if self._nonfinite:
+            return sum(e.result for e in self)  # inf / -inf in range: let float rules decide
+        if self._partials is None:
+            # an intermediate total overflowed: recount the live entries
+            partials: List[float] = []
+            for e in self:
+                _add_exact(partials, e.result)
+                if not math.isfinite(partials[-1]):
+                    exact = sum(map(Fraction, (e.result for e in self)))
+                    try:
+                        return float(exact)
+                    except OverflowError:
+                        return math.inf if exact > 0 else -math.inf
+            self._partials = partials
+        return math.fsum(self._partials)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / len(self) if len(self) else math.nan
+
+    @property
+    def min(self) -> float:
+        return self._mins[0][1] if self._mins else math.nan
+
+    @property
+    def max(self) -> float:
+        return self._maxs[0][1] if self._maxs else math.nan
+
+
+def show_history(history: History) -> None:
+    if not history:
+        print("📜 History: No results yet.")
+        return
+    pages = -(-len(history) // PAGE_SIZE)
+    number = 1
+    while True:
+        print(f"📜 History (page {number}/{pages}, newest first):")
+        for i, entry in enumerate(history.page(number), start=(number - 1) * PAGE_SIZE + 1):
+            print(f"  {i:4d}. {entry.expression} = {entry.result}")
+        print(f"  n={len(history)}  sum={history.sum}  mean={history.mean}  min={history.min}  max={history.max}")
+        if number >= pages or input("Enter for more, q to stop: ").strip().lower() == "q":
+            return
+        number += 1
+
+
+def bench_expressions(n: int = 200_000) -> None:
+    """Per-evaluation cost: parse every time vs the cached compiled form."""
+    source = "3 * x^2 + 2*x - sqrt(x) / 4 + 15%"
+    env = {"x": 0.0}
+
+    start = time.perf_counter()
+    for i in range(n // 20):
+        env["x"] = float(i)
+        CompiledExpression(source).evaluate(env)
+    parse = (time.perf_counter() - start) / (n // 20)
+
+    start = time.perf_counter()
+    for i in range(n):
+        env["x"] = float(i)
+        evaluate(source, env)
+    cached = (time.perf_counter() - start) / n
+
+    expr = compile_expression(source)
+    start = time.perf_counter()
+    for i in range(n):
+        env["x"] = float(i)
+        expr.evaluate(env)
+    compiled = (time.perf_counter() - start) / n
+
+    print(f"parse + evaluate      {parse * 1e6:8.2f} µs")
+    print(f"evaluate (LRU hit)    {cached * 1e6:8.2f} µs")
+    print(f"compiled.evaluate     {compiled * 1e6:8.2f} µs")
+
+
+Column = Union[Sequence[float], "np.ndarray"]
+Operand = Union[Column, float]
+
+
+class BatchResult(NamedTuple):
+    values: Column            # ndarray with NumPy, list otherwise
+    errors: Dict[str, int]    # e.g. {"division by zero": 3}; failed elements are NaN
+
+
+BATCH_OPS = ("add", "subtract", "multiply", "divide", "power", "sqrt", "percentage")
+
+
+def _batch_python(op: str, a: Sequence[float], b) -> BatchResult:
+    n = len(a)
+    bs = repeat(b, n) if isinstance(b, float) else b
+    errors: Dict[str, int] = {}
+    if op == "add":
+        values = list(map(operator.add, a, bs))
+    elif op == "subtract":
+        values = list(map(operator.sub, a, bs))
+    elif op == "multiply":
+        values = list(map(operator.mul, a, bs))
+    elif op == "percentage":
+        values = [pct / 100.0 * base for base, pct in zip(a, bs)]
+    elif op == "divide":
+        zero = (n if b == 0 else 0) if isinstance(b, float) else b.count(0.0)
+        if zero:
+            values = [x / y if y else math.nan for x, y in zip(a, bs)]
+        else:
+            values = list(map(operator.truediv, a, bs))
+        errors["division by zero"] = zero
+    elif op == "sqrt":
+        negative = sum(map((0.0).__gt__, a))
+        if negative:
+            values = [math.sqrt(x) if x >= 0 else math.nan for x in a]
+        else:
+            values = list(map(math.sqrt, a))
+        errors["domain"] = negative
+    elif op == "power":
+        values = []
+        zero = domain = 0
+        for x, y in zip(a, bs):
+            try:
+                values.append(power(x, y))
+            except ZeroDivisionError:
+                zero += 1
+                values.append(math.nan)
+            except OverflowError:
+                values.append(-math.inf if x < 0 and y % 2 == 1 else math.inf)
+            except ValueError:
+                domain += 1
+                values.append(math.nan)
+        errors["division by zero"], errors["domain"] = zero, domain
+    else:
+        raise ValueError(f"unknown operation {op!r}; choose from {', '.join(BATCH_OPS)}")
+    return BatchResult(values, {k: v for k, v in errors.items() if v})
+
+
+def _batch_numpy(op: str, a, b) -> BatchResult:
+    a = np.asarray(a, dtype=np.float64)
+    if b is not None:
+        b = np.asarray(b, dtype=np.float64)
+    errors: Dict[str, int] = {}
+    with np.errstate(all="ignore"):
+        if op == "add":
+            values = a + b
+        elif op == "subtract":
+            values = a - b
+        elif op == "multiply":
+            values = a * b
+        elif op == "percentage":
+            values = b / 100.0 * a
+        elif op == "divide":
+            zero = np.broadcast_to(b == 0, a.shape)
+            values = a / b
+            values[zero] = np.nan
+            errors["division by zero"] = int(zero.sum())
+        elif op == "sqrt":
+            negative = a < 0
+            values = np.sqrt(a)
+            errors["domain"] = int(negative.sum())
+        elif op == "power":
+            zero = (a == 0) & (b < 0)
+            values = np.power(a, b)
+            missing = np.isnan(a) | np.isnan(b)
+            domain = np.isnan(values) & ~missing & ~zero
+            values[zero] = np.nan
+            errors["division by zero"] = int(zero.sum())
+            errors["domain"] = int(domain.sum())
+        else:
+            raise ValueError(f"unknown operation {op!r}; choose from {', '.join(BATCH_OPS)}")
+    return BatchResult(values, {k: v for k, v in errors.items() if v})
+
+
+def batch_op(op: str, a: Column, b: Optional[Operand] = None, use_numpy: Optional[bool] = None) -> BatchResult:
+    """
+    Apply a menu operation elementwise: `a` is a column, `b` a column of the
+    same length or a single number (ignored for sqrt). As in the menu,
+    division by zero and sqrt of a negative give NaN; they are counted in
+    `errors` instead of raising. Uses NumPy when installed unless
+    use_numpy=False.
+    """
+    if op != "sqrt" and b is None:
+        raise ValueError(f"{op} needs a second operand")
+    if isinstance(b, int):
+        b = float(b)
+    if b is not None and not isinstance(b, float) and len(b) != len(a):
+        raise ValueError("operand columns must have the same length")
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy:
+        if np is None:
+            raise RuntimeError("NumPy is not installed")
+        return _batch_numpy(op, a, b)
+    if b is not None and not isinstance(b, float) and not isinstance(b, list):
+        b = list(b)
+    return _batch_python(op, a if isinstance(a, list) else list(a), b)
+
+
+def _parse_cell(cell: str) -> float:
+    try:
+        return float(cell)
+    except ValueError:
+        return math.nan
+
+
+def read_csv_columns(path: str, names: Sequence[str]) -> Tuple[List[List[str]], List[List[float]]]:
+    """Rows of a CSV file (header first) and the named (or 0-based numbered) columns as floats."""
+    with open(path, newline="") as f:
+        rows = list(csv.reader(f))
+    if not rows:
+        raise ValueError(f"{path} is empty")
+    header = rows[0]
+    columns = []
+    for name in names:
+        if name in header:
+            idx = header.index(name)
+        elif name.isdigit() and int(name) < len(header):
+            idx = int(name)
+        else:
+            raise ValueError(f"no column {name!r} in {path}")
+        columns.append([_parse_cell(row[idx]) if idx < len(row) else math.nan for row in rows[1:]])
+    return rows, columns
+
+
+def run_batch(args) -> int:
+    names = [args.a] + ([args.b] if args.b is not None else [])
+    try:
+        rows, columns = read_csv_columns(args.file, names)
+        b = columns[1] if args.b is not None else args.value
+        result = batch_op(args.op, columns[0], b)
+        out = open(args.out, "w", newline="") if args.out else sys.stdout
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    try:
+        writer = csv.writer(out)
+        writer.writerow(rows[0] + [args.name or args.op])
+        for row, value in zip(rows[1:], result.values):
+            writer.writerow(row + [repr(float(value))])
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    for kind, count in result.errors.items():
+        print(f"❌ {count} × {kind} (written as nan)", file=sys.stderr)
+    return 0
+
+
+def bench_batch(n: int = 1_000_000) -> None:
+    """Elementwise divide and sqrt: the menu's per-value call pattern vs the batch paths."""
+    import random
+
+    rng = random.Random(7)
+    a = [rng.uniform(-10, 100) for _ in range(n)]
+    b = [float(rng.randrange(0, 50)) for _ in range(n)]
+
+    def scalar(func, *columns):
+        # what binary_op / unary_op do per value, minus the prompts
+        out = []
+        for args in zip(*columns):
+            try:
+                out.append(func(*args))
+            except (ZeroDivisionError, ValueError):
+                out.append(math.nan)
+        return out
+
+    def scalar_divide():
+        return scalar(lambda x, y: x / y, a, b)
+
+    def scalar_sqrt():
+        return scalar(math.sqrt, a)
+
+    cases = [("scalar", scalar_divide, scalar_sqrt),
+             ("batch (python)", lambda: batch_op("divide", a, b, use_numpy=False),
+              lambda: batch_op("sqrt", a, use_numpy=False))]
+    if np is not None:
+        na, nb = np.array(a), np.array(b)
+        cases.append(("batch (numpy)", lambda: batch_op("divide", na, nb), lambda: batch_op("sqrt", na)))
+    for label, divide, sqrt in cases:
+        timings = []
+        for fn in (divide, sqrt):
+            start = time.perf_counter()
+            fn()
+            timings.append(n / (time.perf_counter() - start) / 1e6)
+        print(f"{label:15s} divide {timings[0]:7.1f} M/s   sqrt {timings[1]:7.1f} M/s")
+
+
+def menu(history_path: Optional[str] = HISTORY_FILE, history_size: int = HISTORY_SIZE) -> None:
+    history = History(history_size, history_path)
+    variables: Dict[str, float] = {}
+
+    actions: List[Tuple[str, Callable[[], HistoryEntry]]] = [
+        ("Add", lambda: binary_op("Addition", lambda x, y: x + y, "{a} + {b}")),
+        ("Subtract", lambda: binary_op("Subtraction", lambda x, y: x - y, "{a} - {b}")),
+        ("Multiply", lambda: binary_op("Multiplication", lambda x, y: x * y, "{a} * {b}")),
+        ("Divide", lambda: binary_op("Division", lambda x, y: x / y, "{a} / {b}")),
+        ("Power (x^y)", lambda: binary_op("Power", power, "{a} ^ {b}")),
+        ("Square Root", lambda: unary_op("Square Root", math.sqrt, "sqrt")),
+        ("Percentage (pct% of base)", lambda: binary_op(
+            "Percentage", percentage, "{b}% of {a}", ("Base: ", "Percent (%): ")
         )),
+        ("Evaluate Expression", lambda: expression_op(variables, history)),
     ]
 
     print("🧮 Welcome to the Calculator!")
@@ -81,16 +826,15 @@ def menu() -> None:
             idx = int(choice)
             if 1 <= idx <= len(actions):
                 _, fn = actions[idx - 1]
-                res = fn()
-                if not math.isnan(res):
-                    history.append(res)
+                history.append(fn())
             elif idx == len(actions) + 1:
-                print("📜 History:", history if history else "No results yet.")
+                show_history(history)
             elif idx == len(actions) + 2:
                 history.clear()
                 print("🧹 History cleared.")
             elif idx == len(actions) + 3:
                 print("👋 Bye!")
+                history.close()
                 break
             else:
                 print("❌ Invalid choice.")
@@ -98,5 +842,32 @@ def menu() -> None:
             print("❌ Enter a number corresponding to the menu.")
 
 
+def cli(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="calculator", description="CLI calculator")
+    parser.add_argument("--history", default=HISTORY_FILE, help=f"history file (default: {HISTORY_FILE})")
+    parser.add_argument("--history-size", type=int, default=HISTORY_SIZE, help="entries kept")
+    sub = parser.add_subparsers(dest="command")
+    p = sub.add_parser("batch", help="apply an operation to CSV columns")
+    p.add_argument("op", choices=BATCH_OPS)
+    p.add_argument("file", help="CSV file with a header row")
+    p.add_argument("--a", required=True, help="first operand column (name or 0-based index)")
+    group = p.add_mutually_exclusive_group()
+    group.add_argument("--b", help="second operand column")
+    group.add_argument("--value", type=float, help="second operand as a constant")
+    p.add_argument("--name", help="result column name (default: the operation)")
+    p.add_argument("--out", help="output CSV (default: stdout)")
+    sub.add_parser("bench", help="expression and batch benchmarks")
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        menu(args.history, args.history_size)
+        return 0
+    if args.command == "bench":
+        bench_expressions()
+        bench_batch()
+        return 0
+    return run_batch(args)
+
+
 if __name__ == "__main__":
-    menu()
\ No newline at end of file
+    sys.exit(cli())
\ No newline at end of file
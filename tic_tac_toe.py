@@ -4,9 +4,30 @@ Tic-Tac-Toe (CLI)
 Modes:
 - Player vs Player
 - Player vs Computer (unbeatable AI using minimax)
+
+The AI searches bitboards (one 9-bit mask per player) with precomputed win
+masks and a transposition table keyed by the symmetry-canonical position,
+so after the first search every reply is a table hit.
+
+Larger variants (N×N boards, k in a row) use AlphaBetaEngine: alpha-beta
+with move ordering and iterative deepening under a time budget.
+
+`python tic_tac_toe.py build-book` precomputes the perfect move for every
+reachable 3×3 position into a small binary table (see OpeningBook); the AI
+then answers with a single lookup.
+
+`python tic_tac_toe.py tournament ...` plays games headlessly across a
+process pool and reports win/draw rates, nodes per second and per-move
+latency percentiles.
 """
 
-from typing import List, Optional, Tuple
+import argparse
+import mmap
+import os
+import random
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 EMPTY = " "
 HUMAN = "X"
@@ -16,6 +37,28 @@ WIN_COMBOS = [
     (0, 3, 6), (1, 4, 7), (2, 5, 8),  # cols
     (0, 4, 8), (2, 4, 6)              # diagonals
 ]
+WIN_MASKS = [(1 << a) | (1 << b) | (1 << c) for a, b, c in WIN_COMBOS]
+FULL = (1 << 9) - 1
+
+# the 8 symmetries of the square, as cell permutations (new index -> old index)
+_ROT = (6, 3, 0, 7, 4, 1, 8, 5, 2)
+_FLIP = (2, 1, 0, 5, 4, 3, 8, 7, 6)
+
+
+def _symmetries() -> List[Tuple[int, ...]]:
+    perms, p = [], tuple(range(9))
+    for _ in range(4):
+        perms.append(p)
+        perms.append(tuple(p[_FLIP[i]] for i in range(9)))
+        p = tuple(p[_ROT[i]] for i in range(9))
+    return perms
+
+
+# per symmetry, a 512-entry table mapping a 9-bit mask to its transformed mask
+SYMMETRY_TABLES = [
+    [sum(1 << i for i in range(9) if m >> perm[i] & 1) for m in range(1 << 9)]
+    for perm in _symmetries()
+]
 
 
 def print_board(b: List[str]) -> None:
@@ -41,11 +84,122 @@ def available_moves(b: List[str]) -> List[int]:
     return [i for i, v in enumerate(b) if v == EMPTY]
 
 
+def is_win(mask: int) -> bool:
+    for w in WIN_MASKS:
+        if mask & w == w:
+            return True
+    return False
+
+
+def to_bitboards(b: List[str]) -> Tuple[int, int]:
+    """(AI mask, human mask) for a list board."""
+    ai = human = 0
+    for i, v in enumerate(b):
+        if v == AI:
+            ai |= 1 << i
+        elif v == HUMAN:
+            human |= 1 << i
+    return ai, human
+
+
+def canonical(ai: int, human: int) -> int:
+    """Smallest 18-bit encoding of the position over all 8 symmetries."""
+    return min(t[ai] | t[human] << 9 for t in SYMMETRY_TABLES)
+
+
+class BitboardEngine:
+    """
+    Exact minimax over bitboards with a transposition table.
+
+    Scores are from the AI's point of view (+1 win, 0 draw, -1 loss). The
+    table is keyed by (canonical position, side to move) and survives
+    between calls; `nodes` and `tt_hits` count work since the last reset.
+    """
+
+    def __init__(self):
+        self.tt: Dict[Tuple[int, bool], int] = {}
+        self.nodes = 0
+        self.tt_hits = 0
+
+    def reset_stats(self) -> None:
+        self.nodes = self.tt_hits = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"nodes": self.nodes, "tt_hits": self.tt_hits, "tt_size": len(self.tt)}
+
+    def score(self, ai: int, human: int, ai_turn: bool) -> int:
+        self.nodes += 1
+        if is_win(ai):
+            return 1
+        if is_win(human):
+            return -1
+        occupied = ai | human
+        if occupied == FULL:
+            return 0
+        key = (canonical(ai, human), ai_turn)
+        cached = self.tt.get(key)
+        if cached is not None:
+            self.tt_hits += 1
+            return cached
+        best = -2 if ai_turn else 2
+        for m in range(9):
+            bit = 1 << m
+            if occupied & bit:
+                continue
+            if ai_turn:
+                best = max(best, self.score(ai | bit, human, False))
+                if best == 1:
+                    break
+            else:
+                best = min(best, self.score(ai, human | bit, True))
+                if best == -1:
+                    break
+        self.tt[key] = best
+        return best
+
+    def best_move(self, ai: int, human: int, ai_turn: bool) -> Tuple[int, Optional[int]]:
+        """(score, move) for the side to move; ties go to the lowest cell, like minimax()."""
+        if is_win(ai):
+            return 1, None
+        if is_win(human):
+            return -1, None
+        occupied = ai | human
+        if occupied == FULL:
+            return 0, None
+        best_score, best_move = (-2 if ai_turn else 2), None
+        for m in range(9):
+            bit = 1 << m
+            if occupied & bit:
+                continue
+            if ai_turn:
+                score = self.score(ai | bit, human, False)
+                if score > best_score:
+                    best_score, best_move = score, m
+            else:
+                score = self.score(ai, human | bit, True)
+                if score < best_score:
+                    best_score, best_move = score, m
+        return best_score, best_move
+
+
+ENGINE = BitboardEngine()
+
+
 def minimax(b: List[str], is_ai_turn: bool) -> Tuple[int, Optional[int]]:
     """
     Returns (score, move)
     score: +1 (AI win), -1 (Human win), 0 (draw)
     """
+    ai, human = to_bitboards(b)
+    return ENGINE.best_move(ai, human, is_ai_turn)
+
+
+def minimax_plain(b: List[str], is_ai_turn: bool) -> Tuple[int, Optional[int]]:
+    """
+    Reference list-based minimax without caching (slow; kept for checks).
+    Returns (score, move)
+    score: +1 (AI win), -1 (Human win), 0 (draw)
+    """
     w = winner(b)
     if w == AI:
         return (1, None)
@@ -59,7 +213,7 @@ def minimax(b: List[str], is_ai_turn: bool) -> Tuple[int, Optional[int]]:
         best_score = -2
         for m in available_moves(b):
             b[m] = AI
-            score, _ = minimax(b, False)
+            score, _ = minimax_plain(b, False)
             b[m] = EMPTY
             if score > best_score:
                 best_score, best_move = score, m
@@ -68,13 +222,503 @@ def minimax(b: List[str], is_ai_turn: bool) -> Tuple[int, Optional[int]]:
         best_score = 2
         for m in available_moves(b):
             b[m] = HUMAN
-            score, _ = minimax(b, True)
+            score, _ = minimax_plain(b, True)
             b[m] = EMPTY
             if score < best_score:
                 best_score, best_move = score, m
         return best_score, best_move
 
 
+BOOK_FILE = "tic_tac_toe.book"
+NO_MOVE = 0xFF
+_CELL_CODE = {EMPTY: 0, HUMAN: 1, AI: 2}
+
+
+def position_code(b: List[str]) -> int:
+    """Base-3 index of a board (EMPTY=0, X=1, O=2; cell 0 least significant)."""
+    code = 0
+    for v in reversed(b):
+        code = code * 3 + _CELL_CODE[v]
+    return code
+
+
+def build_opening_book(path: str = BOOK_FILE) -> int:
+    """
+    Walk every position reachable from the empty board (with either side
+    moving first) and write the AI's optimal move for each position where
+    it is the AI's turn. The file holds 3**9 bytes indexed by
+    position_code(): the low nibble is the move, the next two bits
+    score + 1; NO_MOVE marks positions that never need an AI move.
+    Returns the number of (position, side to move) pairs visited.
+    """
+    table = bytearray([NO_MOVE]) * 3 ** 9
+    seen = set()
+
+    def walk(b: List[str], ai_turn: bool) -> None:
+        code = position_code(b)
+        if (code, ai_turn) in seen:
+            return
+        seen.add((code, ai_turn))
+        if winner(b):
+            return
+        if ai_turn:
+            score, move = minimax(b, True)
+            table[code] = move | (score + 1) << 4
+        for m in available_moves(b):
+            b[m] = AI if ai_turn else HUMAN
+            walk(b, not ai_turn)
+            b[m] = EMPTY
+
+    walk([EMPTY] * 9, False)
+    walk([EMPTY] * 9, True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(table)
+    os.replace(tmp, path)
+    return len(seen)
+
+
+class OpeningBook:
+    """Read-only, memory-mapped view of a table written by build_opening_book()."""
+
+    def __init__(self, path: str = BOOK_FILE):
+        with open(path, "rb") as f:
+            self.table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.table) != 3 ** 9:
+            raise ValueError(f"{path} is not an opening book")
+
+    def lookup(self, b: List[str]) -> Optional[Tuple[int, int]]:
+        """(score, move) for the AI to play in `b`, or None if the book has no entry."""
+        entry = self.table[position_code(b)]
+        if entry == NO_MOVE:
+            return None
+        return (entry >> 4) - 1, entry & 0x0F
+
+    def close(self) -> None:
+        self.table.close()
+
+
+def load_book(path: str = BOOK_FILE) -> Optional[OpeningBook]:
+    try:
+        return OpeningBook(path)
+    except (OSError, ValueError):
+        return None
+
+
+def ai_move(b: List[str], book: Optional[OpeningBook] = None) -> int:
+    """The AI's move: a book lookup when available, else a search."""
+    hit = book.lookup(b) if book is not None else None
+    if hit is not None:
+        return hit[1]
+    return minimax(b, True)[1]
+
+
+def bench_book(path: str = BOOK_FILE, rounds: int = 20_000) -> None:
+    """Per-move latency: book lookup vs bitboard search (cold and warm TT) vs plain minimax."""
+    book = load_book(path)
+    if book is None:
+        build_opening_book(path)
+        book = OpeningBook(path)
+    boards = [list("X        "), list("    X    "), list("X   O   X"), list("XO  X    ")]
+
+    def per_move(fn, reps: int) -> float:
+        start = time.perf_counter()
+        for _ in range(reps):
+            for b in boards:
+                fn(b)
+        return (time.perf_counter() - start) / (reps * len(boards)) * 1e6
+
+    lookup = per_move(book.lookup, rounds)
+    ENGINE.tt.clear()
+    cold = per_move(lambda b: (ENGINE.tt.clear(), minimax(b, True)), 5)
+    warm = per_move(lambda b: minimax(b, True), rounds // 10)
+    plain = per_move(lambda b: minimax_plain(b, True), 1)
+    print(f"book lookup {lookup:.2f} µs | bitboard cold {cold:.0f} µs, warm {warm:.1f} µs | "
+          f"plain minimax {plain:.0f} µs  (per move)")
+    book.close()
+
+
+def win_lines(n: int, k: int) -> List[int]:
+    """Bitmasks of every run of k cells (rows, columns, both diagonals) on an n×n board."""
+    lines = []
+    for r in range(n):
+        for c in range(n):
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                if 0 <= r + dr * (k - 1) < n and 0 <= c + dc * (k - 1) < n:
+                    lines.append(sum(1 << ((r + dr * i) * n + c + dc * i) for i in range(k)))
+    return lines
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class AlphaBetaEngine:
+    """
+    Depth-limited negamax with alpha-beta pruning for n×n boards, k in a row.
+
+    Iterative deepening runs until `time_limit` seconds are used (or the game
+    is solved) and answers with the last completed depth. Moves are ordered
+    transposition-table move first, then by history heuristic and
+    centrality; on big boards only cells near existing stones are tried.
+    Leaves are scored by counting open lines: a line holding only one side's
+    stones is worth WEIGHT_BASE ** stones to that side.
+    """
+
+    WIN = 1_000_000
+    WEIGHT_BASE = 8
+    EXACT, LOWER, UPPER = 0, 1, 2
+
+    def __init__(self, n: int = 3, k: int = 3, time_limit: float = 1.0, max_depth: Optional[int] = None):
+        self.n, self.k = n, k
+        self.cells = n * n
+        self.full = (1 << self.cells) - 1
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.lines = win_lines(n, k)
+        self.lines_through = [[ln for ln in self.lines if ln >> i & 1] for i in range(self.cells)]
+        self.weights = [0] + [self.WEIGHT_BASE ** i for i in range(1, k + 1)]
+        radius = 1 if n >= 10 else 2
+        self.near = [self._square(i, radius) for i in range(self.cells)]
+        mid = (n - 1) / 2
+        self.centrality = [-(abs(i // n - mid) + abs(i % n - mid)) for i in range(self.cells)]
+        self.tt: Dict[Tuple[int, int], Tuple[int, int, int, Optional[int]]] = {}
+        self.history = [0] * self.cells
+        self.nodes = 0
+        self.depth_reached = 0
+        self.deadline = 0.0
+
+    def _square(self, cell: int, radius: int) -> int:
+        r0, c0 = divmod(cell, self.n)
+        mask = 0
+        for r in range(max(0, r0 - radius), min(self.n, r0 + radius + 1)):
+            for c in range(max(0, c0 - radius), min(self.n, c0 + radius + 1)):
+                mask |= 1 << (r * self.n + c)
+        return mask
+
+    def stats(self) -> Dict[str, int]:
+        return {"nodes": self.nodes, "depth": self.depth_reached, "tt_size": len(self.tt)}
+
+    def wins(self, stones: int, move: int) -> bool:
+        for line in self.lines_through[move]:
+            if stones & line == line:
+                return True
+        return False
+
+    def evaluate(self, own: int, opp: int) -> int:
+        score, w = 0, self.weights
+        for line in self.lines:
+            a, b = own & line, opp & line
+            if a and not b:
+                score += w[a.bit_count()]
+            elif b and not a:
+                score -= w[b.bit_count()]
+        return score
+
+    def candidates(self, own: int, opp: int, first: Optional[int] = None) -> List[int]:
+        occupied = own | opp
+        if not occupied:
+            return [self.cells // 2]
+        if self.cells <= 25:
+            area = self.full
+        else:
+            area = 0
+            rest = occupied
+            while rest:
+                low = rest & -rest
+                area |= self.near[low.bit_length() - 1]
+                rest ^= low
+        free = area & ~occupied
+        moves = [i for i in range(self.cells) if free >> i & 1]
+        moves.sort(key=lambda m: (m == first, self.history[m], self.centrality[m]), reverse=True)
+        return moves
+
+    def _negamax(self, own: int, opp: int, depth: int, alpha: int, beta: int, ply: int) -> Tuple[int, Optional[int]]:
+        self.nodes += 1
+        if self.nodes & 255 == 0 and time.perf_counter() > self.deadline:
+            raise SearchTimeout
+        if (own | opp) == self.full:
+            return 0, None
+        if depth == 0:
+            return self.evaluate(own, opp), None
+        key = (own, opp)
+        entry = self.tt.get(key)
+        tt_move = None
+        if entry is not None:
+            e_depth, e_value, e_flag, tt_move = entry
+            if e_depth >= depth and (e_flag == self.EXACT
+                                     or (e_flag == self.LOWER and e_value >= beta)
+                                     or (e_flag == self.UPPER and e_value <= alpha)):
+                return e_value, tt_move
+        alpha0 = alpha
+        best, best_move = -self.WIN - 1, None
+        for m in self.candidates(own, opp, tt_move):
+            placed = own | 1 << m
+            if self.wins(placed, m):
+                value = self.WIN - ply  # quicker wins score higher
+            else:
+                value = -self._negamax(opp, placed, depth - 1, -beta, -alpha, ply + 1)[0]
+            if value > best:
+                best, best_move = value, m
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                self.history[m] += depth * depth
+                break
+        flag = self.UPPER if best <= alpha0 else (self.LOWER if best >= beta else self.EXACT)
+        self.tt[key] = (depth, best, flag, best_move)
+        return best, best_move
+
+    def search(self, own: int, opp: int) -> Tuple[int, Optional[int]]:
+        """(score, move) for the player owning `own`, who is to move."""
+        moves = self.candidates(own, opp)
+        if not moves:
+            return 0, None
+        if len(self.tt) > 2_000_000:
+            self.tt.clear()
+        self.nodes = self.depth_reached = 0
+        self.deadline = time.perf_counter() + self.time_limit
+        best = (0, moves[0])
+        empties = self.cells - (own | opp).bit_count()
+        for depth in range(1, min(self.max_depth or empties, empties) + 1):
+            try:
+                best = self._negamax(own, opp, depth, -self.WIN - 1, self.WIN + 1, 0)
+            except SearchTimeout:
+                break
+            self.depth_reached = depth
+            if abs(best[0]) >= self.WIN - self.cells:
+                break  # forced win or loss found
+        return best
+
+
+class LatencyHistogram:
+    """Log-scale latency histogram: 8 buckets per power of two nanoseconds."""
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        ns = int(seconds * 1e9) or 1
+        exp = ns.bit_length() - 1
+        key = exp * 8 + ((ns << 3 >> exp) & 7)  # the 3 bits after the leading one pick the sub-bucket
+        buckets = self.buckets
+        buckets[key] = buckets.get(key, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for key, n in list(other.buckets.items()):
+            self.buckets[key] = self.buckets.get(key, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, p: float) -> float:
+        """Upper edge (seconds) of the bucket holding the p-th percentile."""
+        if not self.count:
+            return 0.0
+        rank, seen = p / 100 * self.count, 0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen >= rank:
+                exp, sub = divmod(key, 8)
+                return min(self.max, (2 ** exp) * (1 + (sub + 1) / 8) / 1e9)
+        return 0.0
+
+
+class RandomPlayer:
+    def __init__(self, n: int, rng: random.Random):
+        self.cells, self.rng = n * n, rng
+        self.nodes = 0
+
+    def move(self, own: int, opp: int) -> int:
+        occupied = own | opp
+        return self.rng.choice([i for i in range(self.cells) if not occupied >> i & 1])
+
+
+class PerfectPlayer:
+    """Exact 3×3 play through a BitboardEngine (own stones play the AI role)."""
+
+    def __init__(self):
+        self.engine = BitboardEngine()
+
+    @property
+    def nodes(self) -> int:
+        return self.engine.nodes
+
+    def move(self, own: int, opp: int) -> int:
+        return self.engine.best_move(own, opp, True)[1]
+
+
+class AlphaBetaPlayer:
+    def __init__(self, n: int, k: int, time_limit: float):
+        self.engine = AlphaBetaEngine(n, k, time_limit)
+        self.nodes = 0
+
+    def move(self, own: int, opp: int) -> int:
+        m = self.engine.search(own, opp)[1]
+        self.nodes += self.engine.nodes
+        return m
+
+
+PLAYERS = ("random", "perfect", "alphabeta")
+
+
+def make_player(spec: str, n: int, k: int, rng: random.Random, time_limit: float = 0.05):
+    if spec == "random":
+        return RandomPlayer(n, rng)
+    if spec == "perfect":
+        if (n, k) != (3, 3):
+            raise ValueError("the perfect player only handles 3×3")
+        return PerfectPlayer()
+    if spec == "alphabeta":
+        return AlphaBetaPlayer(n, k, time_limit)
+    raise ValueError(f"unknown player '{spec}' (choose from {', '.join(PLAYERS)})")
+
+
+@lru_cache(maxsize=None)
+def lines_through(n: int, k: int) -> Tuple[Tuple[int, ...], ...]:
+    lines = win_lines(n, k)
+    return tuple(tuple(ln for ln in lines if ln >> i & 1) for i in range(n * n))
+
+
+def play_game(x, o, n: int = 3, k: int = 3,
+              latencies: Optional[Tuple[LatencyHistogram, LatencyHistogram]] = None) -> Optional[int]:
+    """
+    Play one headless game; X (`x`) moves first. Players expose
+    move(own, opp) -> cell on bitboards. Returns 0 if X wins, 1 if O
+    wins, None for a draw; per-move think times go into `latencies`.
+    """
+    through = lines_through(n, k)
+    full = (1 << (n * n)) - 1
+    stones = [0, 0]
+    players = (x, o)
+    side = 0
+    while (stones[0] | stones[1]) != full:
+        start = time.perf_counter()
+        m = players[side].move(stones[side], stones[1 - side])
+        if latencies is not None:
+            latencies[side].add(time.perf_counter() - start)
+        stones[side] |= 1 << m
+        for line in through[m]:
+            if stones[side] & line == line:
+                return side
+        side = 1 - side
+    return None
+
+
+def _tournament_chunk(args: Tuple[str, str, int, int, int, int, float]) -> dict:
+    x_spec, o_spec, games, n, k, seed, time_limit = args
+    rng = random.Random(seed)
+    x = make_player(x_spec, n, k, rng, time_limit)
+    o = make_player(o_spec, n, k, rng, time_limit)
+    hists = (LatencyHistogram(), LatencyHistogram())
+    results = [0, 0, 0]  # X wins, O wins, draws
+    for _ in range(games):
+        w = play_game(x, o, n, k, hists)
+        results[2 if w is None else w] += 1
+    return {"results": results, "hists": hists, "nodes": (x.nodes, o.nodes)}
+
+
+def run_tournament(x_spec: str, o_spec: str, games: int, n: int = 3, k: int = 3,
+                   workers: Optional[int] = None, time_limit: float = 0.05, seed: int = 0) -> dict:
+    """Play `games` games split across a multiprocessing pool and aggregate the results."""
+    import multiprocessing
+
+    workers = workers or os.cpu_count() or 1
+    chunks = max(workers * 4, 1)
+    sizes = [games // chunks + (i < games % chunks) for i in range(chunks)]
+    jobs = [(x_spec, o_spec, size, n, k, seed + i, time_limit) for i, size in enumerate(sizes) if size]
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers) as pool:
+        parts = pool.map(_tournament_chunk, jobs)
+    elapsed = time.perf_counter() - start
+    results, nodes = [0, 0, 0], [0, 0]
+    hists = (LatencyHistogram(), LatencyHistogram())
+    for part in parts:
+        for i in range(3):
+            results[i] += part["results"][i]
+        for i in range(2):
+            nodes[i] += part["nodes"][i]
+            hists[i].merge(part["hists"][i])
+    return {"games": games, "results": results, "nodes": nodes, "hists": hists, "elapsed": elapsed}
+
+
+def print_tournament(report: dict, x_spec: str, o_spec: str) -> None:
+    games = report["games"]
+    x_wins, o_wins, draws = report["results"]
+    print(f"🏁 {games} games, X={x_spec} vs O={o_spec}: {games / report['elapsed']:.0f} games/s")
+    print(f"   X wins {x_wins / games:.2%} | O wins {o_wins / games:.2%} | draws {draws / games:.2%}")
+    for label, spec, nodes, hist in zip("XO", (x_spec, o_spec), report["nodes"], report["hists"]):
+        nps = f"{nodes / hist.total:.0f} nodes/s" if nodes and hist.total else "no search"
+        p50, p90, p99 = (hist.percentile(p) * 1e6 for p in (50, 90, 99))
+        print(f"   {label} ({spec}): {hist.count} moves, {nps}, "
+              f"latency p50 {p50:.1f} µs, p90 {p90:.1f} µs, p99 {p99:.1f} µs")
+
+
+def print_grid(cells: List[str], n: int) -> None:
+    width = len(str(n))
+    print("\n" + " " * (width + 1) + " ".join(f"{c + 1:>{width}}" for c in range(n)))
+    for r in range(n):
+        row = cells[r * n:(r + 1) * n]
+        print(f"{r + 1:>{width}} " + " ".join(f"{v if v != EMPTY else '.':>{width}}" for v in row))
+    print()
+
+
+def read_grid_move(cells: List[str], n: int) -> int:
+    while True:
+        parts = input(f"Enter row and column (1-{n} 1-{n}): ").split()
+        if len(parts) == 2 and all(p.isdigit() for p in parts):
+            r, c = int(parts[0]) - 1, int(parts[1]) - 1
+            if 0 <= r < n and 0 <= c < n and cells[r * n + c] == EMPTY:
+                return r * n + c
+        print("❌ Invalid move. Choose an empty cell.")
+
+
+def read_int(prompt: str, default: int) -> int:
+    s = input(f"{prompt} [{default}]: ").strip()
+    return int(s) if s.isdigit() else default
+
+
+def play_custom():
+    print("🧩 Custom board (You vs Computer)")
+    n = max(3, read_int("Board size N", 5))
+    k = min(n, max(3, read_int("Stones in a row to win", 4 if n > 3 else 3)))
+    engine = AlphaBetaEngine(n, k, time_limit=max(1, read_int("Computer think time (seconds)", 2)))
+    cells = [EMPTY] * (n * n)
+    human = ai = 0
+    human_turn = input("Do you want to go first? (y/n): ").strip().lower() == "y"
+    while True:
+        if human_turn:
+            print_grid(cells, n)
+            print("Your turn (X)")
+            m = read_grid_move(cells, n)
+            cells[m], human = HUMAN, human | 1 << m
+            if engine.wins(human, m):
+                print_grid(cells, n)
+                print("🏆 You win!")
+                return
+        else:
+            _, m = engine.search(ai, human)
+            cells[m], ai = AI, ai | 1 << m
+            st = engine.stats()
+            print(f"Computer plays {m // n + 1} {m % n + 1} (depth {st['depth']}, {st['nodes']} nodes)")
+            if engine.wins(ai, m):
+                print_grid(cells, n)
+                print("🤖 Computer wins!")
+                return
+        if (ai | human) == engine.full:
+            print_grid(cells, n)
+            print("🤝 It's a draw!")
+            return
+        human_turn = not human_turn
+
+
 def read_move(b: List[str]) -> int:
     while True:
         s = input("Enter position (1-9): ").strip()
@@ -107,6 +751,7 @@ def play_pvp():
 
 def play_vs_ai():
     b = [EMPTY] * 9
+    book = load_book()
     print("🤖 Tic-Tac-Toe (You vs Computer)")
     human_first = input("Do you want to go first? (y/n): ").strip().lower() == "y"
     while True:
@@ -125,7 +770,7 @@ def play_vs_ai():
                     print("🏆 You win!")
                 return
             # AI turn
-            _, m = minimax(b, True)
+            m = ai_move(b, book)
             b[m] = AI
             w = winner(b)
             if w:
@@ -138,7 +783,7 @@ def play_vs_ai():
         else:
             # AI turn first
             print("Computer's turn (O)")
-            _, m = minimax(b, True)
+            m = ai_move(b, book)
             b[m] = AI
             w = winner(b)
             if w:
@@ -167,17 +812,51 @@ def main():
     print("Tic-Tac-Toe")
     print("1) Player vs Player")
     print("2) Player vs Computer (Unbeatable)")
+    print("3) Custom N×N board vs Computer")
     while True:
-        c = input("Choose mode (1/2): ").strip()
+        c = input("Choose mode (1/2/3): ").strip()
         if c == "1":
             play_pvp()
             break
         elif c == "2":
             play_vs_ai()
             break
+        elif c == "3":
+            play_custom()
+            break
         else:
             print("❌ Invalid choice.")
 
 
+def cli(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="tic_tac_toe", description="Tic-Tac-Toe")
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("play", help="interactive game (default)")
+    sub.add_parser("build-book", help=f"write the 3×3 opening book to {BOOK_FILE}")
+    sub.add_parser("bench", help="book lookup vs search latency")
+    p = sub.add_parser("tournament", help="headless games across a process pool")
+    p.add_argument("--x", default="perfect", choices=PLAYERS, help="player moving first")
+    p.add_argument("--o", default="random", choices=PLAYERS)
+    p.add_argument("--games", type=int, default=10_000)
+    p.add_argument("--workers", type=int, help="processes (default: CPU count)")
+    p.add_argument("-n", type=int, default=3, help="board size")
+    p.add_argument("-k", type=int, default=3, help="stones in a row to win")
+    p.add_argument("--time", type=float, default=0.05, help="alphabeta think time per move (s)")
+    p.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.command == "tournament" and args.games < 1:
+        parser.error("--games must be at least 1")
+
+    if args.command == "build-book":
+        print(f"📖 {build_opening_book()} positions -> {BOOK_FILE}")
+    elif args.command == "bench":
+        bench_book()
+    elif args.command == "tournament":
+        report = run_tournament(args.x, args.o, args.games, args.n, args.k, args.workers, args.time, args.seed)
+        print_tournament(report, args.x, args.o)
+    else:
+        main()
+
+
 if __name__ == "__main__":
-    main()
+    cli()
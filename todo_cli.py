@@ -4,129 +4,1183 @@ To-Do List Manager (CLI)
 Features:
 - Add, list, complete, update, delete tasks
 - Optional due date
-- Persistent storage in JSON
+- Persistent storage in JSON (append-only journal) or SQLite
+- Streaming load and JSON / JSON Lines export, paged listing
 - Search & filter by status
+- Scriptable subcommands and a stdin batch mode (python todo_cli.py --help)
 """
 
+import argparse
 import json
 import os
-from dataclasses import dataclass, asdict
+import re
+import shlex
+import sqlite3
+import sys
+import threading
+import time
+from bisect import bisect_left, insort
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field, replace
 from datetime import datetime
-from typing import List, Optional
+from functools import wraps
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple, Union
 
 DB_FILE = "todos.json"
 DATE_FMT = "%Y-%m-%d"
+PAGE_SIZE = 20
 
 
-@dataclass
+def _today() -> str:
+    return sys.intern(datetime.now().strftime(DATE_FMT))
+
+
+@dataclass(slots=True)
 class Todo:
+    # slotted (no per-instance __dict__); dates are interned so the many
+    # tasks sharing a day share one string object
     id: int
     title: str
     done: bool = False
-    created_at: str = datetime.now().strftime(DATE_FMT)
+    created_at: str = field(default_factory=_today)
     due_date: Optional[str] = None
     notes: Optional[str] = None
 
+    def __post_init__(self):
+        self.created_at = sys.intern(self.created_at)
+        if self.due_date:
+            self.due_date = sys.intern(self.due_date)
+
+
+class Storage:
+    """Persistence backend interface used by TodoManager."""
+
+    # True if other processes may write the same store (TodoManager then polls it)
+    shared = False
+
+    def load(self) -> Iterator[dict]:
+        """Yield every stored record as a plain dict."""
+        raise NotImplementedError
+
+    def put(self, todo: Todo) -> None:
+        """Persist a single added or changed todo."""
+        raise NotImplementedError
+
+    def remove(self, todo_id: int) -> None:
+        """Persist the deletion of a single todo."""
+        raise NotImplementedError
+
+    def rewrite(self, todos: Iterable[Todo]) -> None:
+        """Replace the whole store with the given todos."""
+        raise NotImplementedError
+
+    def apply(self, changes: Dict[int, Optional[Todo]]) -> None:
+        """Persist a batch of changes (id -> todo, None for a deletion) all-or-nothing."""
+        for todo_id, todo in changes.items():
+            if todo is None:
+                self.remove(todo_id)
+            else:
+                self.put(todo)
+
+    def lock(self):
+        """Context manager serialising access with other processes sharing the store."""
+        return nullcontext()
+
+    def poll(self) -> Optional[Dict[int, Optional[dict]]]:
+        """
+        Changes written by others since our last load/poll, as id -> record
+        (None for a deletion); None means a full reload is required.
+        """
+        return {}
+
+    def changed(self) -> bool:
+        """Cheap check made without the lock: False means poll() would find nothing."""
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+def iter_json_array(f: TextIO, chunk_size: int = 1 << 16) -> Iterator:
+    """Yield the elements of a top-level JSON array one at a time, reading `f` in chunks."""
+    decode = json.JSONDecoder().raw_decode
+    buf, pos, started, eof = "", 0, False, False
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+        if pos < len(buf):
+            if not started:
+                if buf[pos] != "[":
+                    raise ValueError("expected a JSON array")
+                started, pos = True, pos + 1
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                item, end = decode(buf, pos)
+            except ValueError:
+                if eof:
+                    raise
+            else:
+                # a value touching the buffer end may be cut short (e.g. a number)
+                if end < len(buf) or eof:
+                    yield item
+                    pos = end
+                    continue
+        if eof:
+            raise ValueError("unterminated JSON array")
+        chunk = f.read(chunk_size)
+        buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+
+
+def iter_jsonl(f: TextIO) -> Iterator:
+    """Yield one decoded value per non-blank line (JSON Lines)."""
+    for line in f:
+        if line.strip():
+            yield json.loads(line)
+
+
+def read_records(path: str) -> Iterator[dict]:
+    """Stream todo records from a JSON array or JSON Lines file (sniffed from the first byte)."""
+    with open(path, "r", encoding="utf-8") as f:
+        head = f.read(1)
+        while head.isspace():
+            head = f.read(1)
+        f.seek(0)
+        yield from (iter_json_array(f) if head == "[" else iter_jsonl(f))
+
+
+def write_jsonl(path: str, records: Iterable[dict]) -> int:
+    """Write one record per line; returns the number of records written."""
+    n = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for r in records:
+            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+            n += 1
+    return n
+
+
+def _write_snapshot(path: str, records: Iterable[dict]) -> None:
+    """Atomically write records as a JSON array, one record per line (temp file + rename)."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        sep = "[\n  "
+        for r in records:
+            f.write(sep)
+            f.write(json.dumps(r, ensure_ascii=False))
+            sep = ",\n  "
+        f.write("[]\n" if sep.startswith("[") else "\n]\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class FileLock:
+    """
+    Exclusive inter-process lock on a side file (flock on POSIX, msvcrt on
+    Windows). Re-entrant within a thread; other threads of the same process
+    wait on an internal RLock, other processes on the OS lock.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._rlock = threading.RLock()
+        self._depth = 0
+        self.fd: Optional[int] = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        if not self._rlock.acquire(blocking):
+            return False
+        if self._depth == 0:
+            if self.fd is None:
+                self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                _os_lock(self.fd, blocking)
+            except OSError:
+                self._rlock.release()
+                if blocking:
+                    raise
+                return False
+        self._depth += 1
+        return True
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            _os_unlock(self.fd)
+        self._rlock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+    def close(self) -> None:
+        if self.fd is not None and self._depth == 0:
+            os.close(self.fd)
+            self.fd = None
+
+
+if os.name == "nt":
+    import msvcrt
+
+    def _os_lock(fd: int, blocking: bool) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+
+    def _os_unlock(fd: int) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _os_lock(fd: int, blocking: bool) -> None:
+        fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+
+    def _os_unlock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def _stat(path: str) -> Optional[os.stat_result]:
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+
+class JournalStorage(Storage):
+    """
+    JSON snapshot (the classic todos.json) plus an append-only journal.
+
+    Each mutation appends one line to `<db>.journal`, so a write costs O(1)
+    instead of rewriting the whole file. Once the journal holds
+    `compact_after` entries it is rotated to `<db>.compacting` and a
+    background thread folds it into a fresh snapshot. Replaying the journal
+    is idempotent, so a crash at any point during compaction is harmless.
+    The snapshot is streamed record by record on both load and compaction;
+    only the (bounded) journal is held in memory.
+
+    Several processes may share one database. Writers serialise on
+    `<db>.lock`, which also stores a generation number bumped whenever the
+    snapshot is replaced wholesale. Each process remembers which journal
+    file (by inode) it has read up to which offset, so picking up other
+    processes' writes means reading just the new journal tail; a full
+    reload is only needed when the generation changed or a journal it
+    never finished reading has been compacted away. Reads first compare a
+    plain stat() of the lock and journal files with what was last seen, so
+    when nobody else wrote they take no lock and open no file.
+    """
+
+    # stat() times this close to our last look may hide a later write
+    # within the filesystem's timestamp granularity
+    RACY_NS = 1_000_000_000
+
+    def __init__(self, path: str, compact_after: int = 1000):
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.compacting_path = f"{path}.compacting"
+        self.compact_after = compact_after
+        self.shared = True
+        self._lock = FileLock(f"{path}.lock")
+        self._compact_lock = FileLock(f"{path}.compact.lock")
+        self._compactor: Optional[threading.Thread] = None
+        self._entries = 0  # entries in the current journal
+        self._journal_ino: Optional[int] = None
+        self._offset = 0  # bytes of the current journal already applied
+        self._gen = 0
+        self._seen: Optional[tuple] = None  # file signature our state matches
+        self._seen_at = 0
+
+    def lock(self) -> FileLock:
+        return self._lock
+
+    def _read_gen(self) -> int:
+        os.lseek(self._lock.fd, 0, os.SEEK_SET)
+        raw = os.read(self._lock.fd, 32)
+        return int(raw) if raw.strip() else 0
+
+    def _bump_gen(self) -> None:
+        self._gen = self._read_gen() + 1
+        os.lseek(self._lock.fd, 0, os.SEEK_SET)
+        os.ftruncate(self._lock.fd, 0)
+        os.write(self._lock.fd, str(self._gen).encode())
+
+    @staticmethod
+    def _replay(path: str, changes: Dict[int, Optional[dict]], offset: int = 0) -> Tuple[int, int]:
+        """
+        Collect journal entries from `offset` as id -> record (None for a
+        deletion). Returns (entries read, offset past the last complete entry).
+        """
+        count = 0
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return count, offset
+        with f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn or still being written: everything before it is intact
+                offset += len(line)
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                for op in entry.get("batch", (entry,)):
+                    if "put" in op:
+                        changes[op["put"]["id"]] = op["put"]
+                    else:
+                        changes[op["del"]] = None
+                count += 1
+        return count, offset
+
+    def _merged(self, changes: Dict[int, Optional[dict]]) -> Iterator[dict]:
+        """Stream the snapshot with journal changes applied."""
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                for item in iter_json_array(f):
+                    if item["id"] in changes:
+                        item = changes.pop(item["id"])
+                        if item is None:
+                            continue
+                    yield item
+        for todo_id in sorted(changes):
+            if changes[todo_id] is not None:
+                yield changes[todo_id]
+
+    def _signature(self) -> tuple:
+        return tuple(None if st is None else (st.st_ino, st.st_size, st.st_mtime_ns)
+                     for st in (_stat(self._lock.path), _stat(self.journal_path)))
+
+    def _remember(self) -> None:
+        # called with the lock held, once our state reflects every write so far
+        self._seen, self._seen_at = self._signature(), time.time_ns()
+
+    def changed(self) -> bool:
+        sig = self._signature()
+        if sig != self._seen:
+            return True
+        return any(st is not None and st[2] >= self._seen_at - self.RACY_NS for st in sig)
+
+    def _ensure_journal(self) -> os.stat_result:
+        with open(self.journal_path, "ab"):
+            pass
+        return os.stat(self.journal_path)
+
+    def load(self) -> Iterator[dict]:
+        # called with the lock held
+        if not os.path.exists(self.path):
+            _write_snapshot(self.path, [])
+        if os.path.exists(self.compacting_path) and self._compact_lock.acquire(blocking=False):
+            try:
+                self._fold()  # finish a compaction whose process died
+            finally:
+                self._compact_lock.release()
+        self._gen = self._read_gen()
+        changes: Dict[int, Optional[dict]] = {}
+        self._replay(self.compacting_path, changes)
+        self._journal_ino = self._ensure_journal().st_ino
+        self._entries, self._offset = self._replay(self.journal_path, changes)
+        self._remember()
+        return self._merged(changes)
+
+    def poll(self) -> Optional[Dict[int, Optional[dict]]]:
+        # called with the lock held
+        if self._read_gen() != self._gen:
+            return None
+        changes: Dict[int, Optional[dict]] = {}
+        journal = self._ensure_journal()
+        if journal.st_ino != self._journal_ino:
+            # our journal was rotated: finish it, then start on the new one
+            compacting = _stat(self.compacting_path)
+            if compacting is None or compacting.st_ino != self._journal_ino:
+                return None  # already compacted away; its tail is lost to us
+            self._replay(self.compacting_path, changes, self._offset)
+            self._journal_ino, self._offset, self._entries = journal.st_ino, 0, 0
+        if journal.st_size > self._offset:
+            count, self._offset = self._replay(self.journal_path, changes, self._offset)
+            self._entries += count
+        self._remember()
+        return changes
+
+    def _append(self, entry: dict) -> None:
+        # called with the lock held, right after poll(): anything past our
+        # offset is a torn line left by a crashed writer
+        line = (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._lock:
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(self._offset)
+                f.seek(self._offset)
+                f.write(line)
+            self._offset += len(line)
+            self._entries += 1
+            if self._entries >= self.compact_after:
+                self._start_compaction()
+            self._remember()
+
+    def put(self, todo: Todo) -> None:
+        self._append({"put": asdict(todo)})
+
+    def remove(self, todo_id: int) -> None:
+        self._append({"del": todo_id})
+
+    def apply(self, changes: Dict[int, Optional[Todo]]) -> None:
+        # A small batch is a single journal line: a torn line is dropped on
+        # replay, so the batch lands entirely or not at all. A batch big enough
+        # to trigger compaction anyway is merged straight into a new snapshot,
+        # unless a compaction is already running.
+        with self._lock:
+            if len(changes) < self.compact_after or os.path.exists(self.compacting_path):
+                self._append({"batch": [{"del": i} if t is None else {"put": asdict(t)}
+                                        for i, t in changes.items()]})
+                return
+            merged: Dict[int, Optional[dict]] = {}
+            self._replay(self.journal_path, merged)
+            for todo_id, todo in changes.items():
+                merged[todo_id] = None if todo is None else asdict(todo)
+            self._replace_all(self._merged(merged))
+
+    def rewrite(self, todos: Iterable[Todo]) -> None:
+        with self._lock:
+            if os.path.exists(self.compacting_path):
+                os.remove(self.compacting_path)  # a running compactor notices the new generation
+            self._replace_all(asdict(t) for t in todos)
+
+    def _replace_all(self, records: Iterable[dict]) -> None:
+        # called with the lock held
+        _write_snapshot(self.path, records)
+        with open(self.journal_path, "wb"):
+            pass
+        self._bump_gen()
+        self._journal_ino = os.stat(self.journal_path).st_ino
+        self._offset = self._entries = 0
+        self._remember()
+
+    def _start_compaction(self) -> None:
+        # called with the lock held
+        if os.path.exists(self.compacting_path):
+            return  # another compaction (maybe in another process) is still running
+        os.replace(self.journal_path, self.compacting_path)
+        self._journal_ino = self._ensure_journal().st_ino
+        self._offset = self._entries = 0
+        self._compactor = threading.Thread(target=self.compact, name="todo-compactor")
+        self._compactor.start()
+
+    def compact(self) -> None:
+        """Fold the rotated journal into the snapshot."""
+        with self._compact_lock:
+            self._fold()
+
+    def _fold(self) -> None:
+        # called with the compaction lock held; the slow part runs unlocked
+        with self._lock:
+            if not os.path.exists(self.compacting_path):
+                return  # already folded by another process
+            gen = self._read_gen()
+        changes: Dict[int, Optional[dict]] = {}
+        self._replay(self.compacting_path, changes)
+        tmp = f"{self.path}.compact.tmp"
+        _write_snapshot(tmp, self._merged(changes))
+        with self._lock:
+            if self._read_gen() != gen:
+                os.remove(tmp)  # the store was replaced meanwhile; this fold is stale
+                return
+            os.replace(tmp, self.path)
+            os.remove(self.compacting_path)
+
+    def wait(self) -> None:
+        """Block until a background compaction started here has finished."""
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+
+    def close(self) -> None:
+        self.wait()
+        self._lock.close()
+        self._compact_lock.close()
+
+
+class SQLiteStorage(Storage):
+    """SQLite-backed storage; every mutation touches exactly one row."""
+
+    COLUMNS = ("id", "title", "done", "created_at", "due_date", "notes")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.shared = True
+        self._lock = FileLock(f"{path}.lock")
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS todos ("
+            "id INTEGER PRIMARY KEY, title TEXT NOT NULL, done INTEGER NOT NULL, "
+            "created_at TEXT NOT NULL, due_date TEXT, notes TEXT)"
+        )
+        self.conn.commit()
+        self._data_version = None
+
+    def lock(self) -> FileLock:
+        return self._lock
+
+    def poll(self) -> Optional[Dict[int, Optional[dict]]]:
+        # data_version changes whenever another connection commits
+        version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._data_version:
+            self._data_version = version
+            return None
+        return {}
+
+    def load(self) -> Iterator[dict]:
+        self._data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        cur = self.conn.execute(f"SELECT {', '.join(self.COLUMNS)} FROM todos ORDER BY id")
+        for row in cur:
+            record = dict(zip(self.COLUMNS, row))
+            record["done"] = bool(record["done"])
+            yield record
+
+    def _row(self, t: Todo) -> tuple:
+        return (t.id, t.title, int(t.done), t.created_at, t.due_date, t.notes)
+
+    def put(self, todo: Todo) -> None:
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO todos VALUES (?, ?, ?, ?, ?, ?)", self._row(todo))
+
+    def remove(self, todo_id: int) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM todos WHERE id = ?", (todo_id,))
+
+    def rewrite(self, todos: Iterable[Todo]) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM todos")
+            self.conn.executemany("INSERT INTO todos VALUES (?, ?, ?, ?, ?, ?)", (self._row(t) for t in todos))
+
+    def apply(self, changes: Dict[int, Optional[Todo]]) -> None:
+        with self.conn:
+            self.conn.executemany("DELETE FROM todos WHERE id = ?",
+                                  ((i,) for i, t in changes.items() if t is None))
+            self.conn.executemany("INSERT OR REPLACE INTO todos VALUES (?, ?, ?, ?, ?, ?)",
+                                  (self._row(t) for t in changes.values() if t is not None))
+
+    def close(self) -> None:
+        self.conn.close()
+        self._lock.close()
+
+
+def open_storage(db_path: str) -> Storage:
+    """Pick a backend from the file extension (.db/.sqlite -> SQLite, else JSON journal)."""
+    if os.path.splitext(db_path)[1].lower() in (".db", ".sqlite", ".sqlite3"):
+        return SQLiteStorage(db_path)
+    return JournalStorage(db_path)
+
+
+class MemoryStorage(Storage):
+    """Non-persistent backend, handy for benchmarks and throwaway lists."""
+
+    def load(self) -> Iterator[dict]:
+        return iter(())
+
+    def put(self, todo: Todo) -> None:
+        pass
+
+    def remove(self, todo_id: int) -> None:
+        pass
+
+    def rewrite(self, todos: Iterable[Todo]) -> None:
+        pass
+
+    def apply(self, changes: Dict[int, Optional[Todo]]) -> None:
+        pass
+
+
+class SortedList:
+    """
+    Sorted sequence kept as a list of bounded chunks, so an insert or removal
+    moves at most a chunk's worth of items instead of shifting the whole list.
+    """
+
+    CHUNK = 512
+
+    def __init__(self, items: Iterable = ()):
+        items = sorted(items)
+        self._chunks = [items[i:i + self.CHUNK] for i in range(0, len(items), self.CHUNK)]
+        self._maxes = [c[-1] for c in self._chunks]
+        self._len = len(items)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator:
+        for chunk in self._chunks:
+            yield from chunk
+
+    def add(self, item) -> None:
+        if not self._chunks:
+            self._chunks, self._maxes = [[item]], [item]
+        else:
+            i = min(bisect_left(self._maxes, item), len(self._maxes) - 1)
+            chunk = self._chunks[i]
+            insort(chunk, item)
+            self._maxes[i] = chunk[-1]
+            if len(chunk) > 2 * self.CHUNK:
+                self._chunks[i:i + 1] = [chunk[:self.CHUNK], chunk[self.CHUNK:]]
+                self._maxes[i:i + 1] = [chunk[self.CHUNK - 1], chunk[-1]]
+        self._len += 1
+
+    def discard(self, item) -> None:
+        i = bisect_left(self._maxes, item)
+        if i == len(self._maxes):
+            return
+        chunk = self._chunks[i]
+        j = bisect_left(chunk, item)
+        if j < len(chunk) and chunk[j] == item:
+            del chunk[j]
+            self._len -= 1
+            if chunk:
+                self._maxes[i] = chunk[-1]
+            else:
+                del self._chunks[i], self._maxes[i]
+
+    def irange(self, start=None, stop=None) -> Iterator:
+        """Items x with start <= x < stop (either bound may be omitted), in order."""
+        i = 0 if start is None else bisect_left(self._maxes, start)
+        j = 0 if start is None or i == len(self._chunks) else bisect_left(self._chunks[i], start)
+        for chunk in self._chunks[i:]:
+            for k in range(j, len(chunk)):
+                if stop is not None and not chunk[k] < stop:
+                    return
+                yield chunk[k]
+            j = 0
+
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+class InvertedIndex:
+    """
+    Token -> {todo id: weight} postings over title and notes.
+
+    Title hits weigh more than notes hits. A sorted vocabulary makes prefix
+    expansion a bisect plus a scan over the matching tokens only.
+    """
+
+    TITLE_WEIGHT = 3
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.vocab = SortedList()
+
+    def _weights(self, title: str, notes: Optional[str]) -> Dict[str, int]:
+        weights: Dict[str, int] = {}
+        for tok in tokenize(notes):
+            weights[tok] = weights.get(tok, 0) + 1
+        for tok in tokenize(title):
+            weights[tok] = weights.get(tok, 0) + self.TITLE_WEIGHT
+        return weights
+
+    def add(self, todo_id: int, title: str, notes: Optional[str], keep_sorted: bool = True) -> None:
+        for tok, w in self._weights(title, notes).items():
+            posting = self.postings.get(tok)
+            if posting is None:
+                posting = self.postings[tok] = {}
+                if keep_sorted:
+                    self.vocab.add(tok)
+            posting[todo_id] = w
+
+    def rebuild(self, todos: Iterable[Todo]) -> None:
+        """Bulk (re)build: one sort of the vocabulary instead of N inserts."""
+        self.postings.clear()
+        for t in todos:
+            self.add(t.id, t.title, t.notes, keep_sorted=False)
+        self.vocab = SortedList(self.postings)
+
+    def remove(self, todo_id: int, title: str, notes: Optional[str]) -> None:
+        for tok in self._weights(title, notes):
+            posting = self.postings[tok]
+            del posting[todo_id]
+            if not posting:
+                del self.postings[tok]
+                self.vocab.discard(tok)
+
+    def _expand(self, term: str, prefix: bool) -> Dict[int, int]:
+        """Scores of every todo containing `term` (or a token starting with it)."""
+        if not prefix:
+            return dict(self.postings.get(term, {}))
+        scores: Dict[int, int] = {}
+        for tok in self.vocab.irange(term):
+            if not tok.startswith(term):
+                break
+            # exact token matches rank above mere prefix matches
+            bonus = 2 if tok == term else 1
+            for todo_id, w in self.postings[tok].items():
+                scores[todo_id] = scores.get(todo_id, 0) + w * bonus
+        return scores
+
+    def search(self, query: str, prefix: bool = True) -> List[Tuple[int, int]]:
+        """(id, score) pairs of todos matching every query term, best first."""
+        terms = tokenize(query)
+        if not terms:
+            return []
+        per_term = sorted((self._expand(t, prefix) for t in set(terms)), key=len)
+        scores = per_term[0]
+        for other in per_term[1:]:
+            scores = {i: sc + other[i] for i, sc in scores.items() if i in other}
+            if not scores:
+                break
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+class TodoView(Sequence):
+    """
+    Read-only, live sequence of a manager's todos in id order. Nothing is
+    copied: len() and iteration are direct, and an index walks from
+    whichever end is nearer (so [0] and [-1] are O(1)).
+    """
+
+    __slots__ = ("_manager",)
+
+    def __init__(self, manager: "TodoManager"):
+        self._manager = manager
+
+    def __len__(self) -> int:
+        return len(self._manager._items())
+
+    def __iter__(self) -> Iterator[Todo]:
+        return iter(self._manager._items().values())
+
+    def __reversed__(self) -> Iterator[Todo]:
+        return reversed(self._manager._items().values())
+
+    def __getitem__(self, index):
+        items = self._manager._items()
+        if isinstance(index, slice):
+            return list(items.values())[index]
+        n = len(items)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("todo index out of range")
+        if index <= n // 2:
+            return next(islice(items.values(), index, None))
+        return next(islice(reversed(items.values()), n - 1 - index, None))
+
+    def __repr__(self) -> str:
+        return f"TodoView({list(self)!r})"
+
+
+def _exclusive(method):
+    """Run a TodoManager mutation under the storage lock on up-to-date state."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._locked():
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 class TodoManager:
-    def __init__(self, db_path: str = DB_FILE):
+    def __init__(self, db_path: str = DB_FILE, storage: Optional[Storage] = None):
         self.db_path = db_path
-        self.todos: List[Todo] = []
-        self._load()
+        self.storage = storage if storage is not None else open_storage(db_path)
+        self._index: Optional[Dict[int, Todo]] = None  # id -> Todo, in id order
+        self._last_id = 0
+        self._text = InvertedIndex()
+        self._open: Dict[int, None] = {}  # ordered set of ids that are not done
+        self._due_all = SortedList()  # (due_date, id)
+        self._due_open = SortedList()  # same, open tasks only
+        # set while inside batch(): changes to flush, and pre-images for rollback
+        self._pending: Optional[Dict[int, Optional[Todo]]] = None
+        self._undo: Dict[int, Optional[Todo]] = {}
+        self._lock_depth = 0
 
-    def _load(self):
-        if not os.path.exists(self.db_path):
-            self._save()
-        else:
+    @property
+    def todos(self) -> TodoView:
+        """
+        Live, read-only sequence of every todo in id order (no copy is made).
+
+        Use add()/delete() to change the list. Assigning a new sequence to
+        `todos` replaces it in memory only, without persisting it; on a
+        shared store, the next reload caused by another process's write
+        brings back the stored list.
+        """
+        return TodoView(self)
+
+    @todos.setter
+    def todos(self, value: List[Todo]) -> None:
+        self._reset(value)
+
+    def _items(self) -> Dict[int, Todo]:
+        # loaded lazily on first access; shared stores are re-synced on an
+        # access from outside a locked operation if they may have changed
+        if self._lock_depth == 0 and (self._index is None or
+                                      (self.storage.shared and self.storage.changed())):
+            with self._locked():
+                pass
+        return self._index
+
+    @contextmanager
+    def _locked(self):
+        """Hold the storage lock and bring the in-memory state up to date."""
+        with self.storage.lock():
+            self._lock_depth += 1
             try:
-                with open(self.db_path, "r", encoding="utf-8") as f:
-                    raw = json.load(f)
-                self.todos = [Todo(**item) for item in raw]
-            except Exception:
-                self.todos = []
-                self._save()
+                if self._lock_depth == 1:
+                    self._sync()
+                yield
+            finally:
+                self._lock_depth -= 1
+
+    def _sync(self) -> None:
+        if self._index is None:
+            self._load()
+            return
+        changes = self.storage.poll()
+        if changes is None:
+            self._load()
+            return
+        for todo_id, record in changes.items():
+            self._apply_remote(todo_id, record)
+
+    def _apply_remote(self, todo_id: int, record: Optional[dict]) -> None:
+        current = self._index.get(todo_id)
+        if record is None:
+            if current is not None:
+                self._unindex_todo(current)
+            return
+        if current is None:
+            self._index_todo(Todo(**record))
+            return
+        # update in place so the id keeps its position in the index
+        self._unindex_fields(current)
+        fresh = Todo(**record)
+        if fresh.done:
+            self._open.pop(todo_id, None)
+        elif current.done:
+            self._open[todo_id] = None
+        current.title, current.done, current.created_at = fresh.title, fresh.done, fresh.created_at
+        current.due_date, current.notes = fresh.due_date, fresh.notes
+        self._index_fields(current)
 
-    def _save(self):
-        with open(self.db_path, "w", encoding="utf-8") as f:
-            json.dump([asdict(t) for t in self.todos], f, indent=2)
+    def _reset(self, todos: Iterable[Todo]) -> None:
+        self._index = {}
+        self._last_id = 0
+        for t in todos:
+            self._index[t.id] = t
+            if t.id > self._last_id:
+                self._last_id = t.id
+        self._text.rebuild(self._index.values())
+        self._open = {t.id: None for t in self._index.values() if not t.done}
+        self._due_all = SortedList((t.due_date, t.id) for t in self._index.values() if t.due_date)
+        self._due_open = SortedList(key for key in self._due_all if key[1] in self._open)
+
+    def _index_todo(self, t: Todo) -> None:
+        self._index[t.id] = t
+        if t.id > self._last_id:
+            self._last_id = t.id
+        if not t.done:
+            self._open[t.id] = None
+        self._index_fields(t)
+
+    def _unindex_todo(self, t: Todo) -> None:
+        del self._index[t.id]
+        self._open.pop(t.id, None)
+        self._unindex_fields(t)
+
+    # secondary indexes: drop before a todo's fields change, re-add afterwards
+    def _index_fields(self, t: Todo) -> None:
+        self._text.add(t.id, t.title, t.notes)
+        if t.due_date:
+            self._due_all.add((t.due_date, t.id))
+            if not t.done:
+                self._due_open.add((t.due_date, t.id))
+
+    def _unindex_fields(self, t: Todo) -> None:
+        self._text.remove(t.id, t.title, t.notes)
+        if t.due_date:
+            self._due_all.discard((t.due_date, t.id))
+            if not t.done:
+                self._due_open.discard((t.due_date, t.id))
+
+    def _load(self):
+        # A store that fails to load is reported, never replaced: it may be
+        # shared, and wiping it would wipe it for every process. Until a load
+        # succeeds every access retries it (and fails the same way).
+        try:
+            todos = [Todo(**item) for item in self.storage.load()]
+        except (TypeError, KeyError, ValueError, OSError) as e:
+            self._index = None
+            raise ValueError(f"cannot load {self.db_path}: {e}") from e
+        self._reset(todos)
+
+    def close(self) -> None:
+        self.storage.close()
+
+    def __enter__(self) -> "TodoManager":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._items())
 
     def _next_id(self) -> int:
-        return max([t.id for t in self.todos], default=0) + 1
+        self._items()
+        return self._last_id + 1
 
-    def add(self, title: str, due_date: Optional[str] = None, notes: Optional[str] = None) -> Todo:
+    def _before_change(self, todo_id: int) -> None:
+        # inside a batch, remember the first pre-image of every touched todo
+        if self._pending is not None and todo_id not in self._undo:
+            t = self._index.get(todo_id)
+            self._undo[todo_id] = replace(t) if t is not None else None
+
+    def _persist(self, t: Todo) -> None:
+        if self._pending is not None:
+            self._pending[t.id] = t
+        else:
+            self.storage.put(t)
+
+    def _persist_delete(self, todo_id: int) -> None:
+        if self._pending is not None:
+            self._pending[todo_id] = None
+        else:
+            self.storage.remove(todo_id)
+
+    @contextmanager
+    def batch(self):
+        """
+        Group mutations into one transaction: changes apply in memory and are
+        flushed to storage once on exit. If the block (or the flush) raises,
+        every change made inside it is rolled back. Nested batches join the
+        outermost one. The storage lock is held throughout, so a batch is
+        also the way to make a read-modify-write atomic across processes.
+        """
+        if self._pending is not None:
+            yield self
+            return
+        with self._locked():
+            self._pending, self._undo = {}, {}
+            last_id = self._last_id
+            try:
+                yield self
+                if self._pending:
+                    self.storage.apply(self._pending)
+            except BaseException:
+                self._rollback(last_id)
+                raise
+            finally:
+                self._pending, self._undo = None, {}
+
+    def _rollback(self, last_id: int) -> None:
+        for todo_id, before in self._undo.items():
+            current = self._index.get(todo_id)
+            if current is not None:
+                self._unindex_todo(current)
+            if before is not None:
+                self._index_todo(before)
+        # restored todos were re-inserted at the end: put ids back in order
+        self._index = dict(sorted(self._index.items()))
+        self._open = dict.fromkeys(sorted(self._open))
+        self._last_id = last_id
+
+    @staticmethod
+    def _check_due(due_date: Optional[str]) -> None:
         if due_date:
-            # validate date
             try:
                 datetime.strptime(due_date, DATE_FMT)
             except ValueError:
                 raise ValueError(f"Due date must be {DATE_FMT} (e.g., 2025-08-17)")
+
+    @classmethod
+    def _import_fields(cls, item: Union[str, dict]) -> dict:
+        if isinstance(item, str):
+            item = {"title": item}
+        if not isinstance(item, dict):
+            raise ValueError(f"task record must be a title or an object, not {type(item).__name__}")
+        if not isinstance(item.get("title"), str) or not item["title"].strip():
+            raise ValueError(f"task record needs a non-empty string 'title': {item!r}")
+        for k in ("due_date", "notes", "created_at"):
+            if item.get(k) is not None and not isinstance(item[k], str):
+                raise ValueError(f"task field {k!r} must be a string: {item!r}")
+        if not isinstance(item.get("done", False), bool):
+            raise ValueError(f"task field 'done' must be true or false: {item!r}")
+        cls._check_due(item.get("due_date"))
+        return {k: item[k] for k in ("title", "due_date", "notes", "done", "created_at")
+                if item.get(k) is not None}
+
+    @_exclusive
+    def add(self, title: str, due_date: Optional[str] = None, notes: Optional[str] = None) -> Todo:
+        self._check_due(due_date)
         todo = Todo(id=self._next_id(), title=title, due_date=due_date, notes=notes)
-        self.todos.append(todo)
-        self._save()
+        self._before_change(todo.id)
+        self._index_todo(todo)
+        self._persist(todo)
         return todo
 
-    def list(self, only_open: bool = False) -> List[Todo]:
-        return [t for t in self.todos if (not only_open or not t.done)]
+    def add_many(self, items: Iterable[Union[str, dict]]) -> List[Todo]:
+        """
+        Add many tasks in one batch. Each item is a title or a dict with
+        `title` and optionally `due_date`, `notes`, `done`, `created_at`
+        (any `id` is ignored; new ids are assigned). A malformed item raises
+        ValueError before any task is added.
+        """
+        # validate everything up front so a bad record adds nothing at all,
+        # even when joining an enclosing batch that will carry on
+        records = [self._import_fields(item) for item in items]
+        added = []
+        with self.batch():
+            for fields in records:
+                todo = Todo(id=self._next_id(), **fields)
+                self._before_change(todo.id)
+                self._index_todo(todo)
+                self._persist(todo)
+                added.append(todo)
+        return added
+
+    def complete_many(self, todo_ids: Iterable[int]) -> int:
+        """Complete every given task in one batch; returns how many were found."""
+        with self.batch():
+            return sum(self.complete(i) for i in todo_ids)
+
+    def delete_many(self, todo_ids: Iterable[int]) -> int:
+        """Delete every given task in one batch; returns how many were found."""
+        with self.batch():
+            return sum(self.delete(i) for i in todo_ids)
+
+    def iter_todos(self, only_open: bool = False, offset: int = 0,
+                   limit: Optional[int] = None) -> Iterator[Todo]:
+        """Lazily walk tasks in id order, optionally one page at a time."""
+        items = self._items()
+        source = (items[i] for i in self._open) if only_open else iter(items.values())
+        stop = None if limit is None else offset + limit
+        return islice(source, offset, stop)
+
+    def count(self, only_open: bool = False) -> int:
+        items = self._items()
+        return len(self._open) if only_open else len(items)
+
+    def list(self, only_open: bool = False, offset: int = 0, limit: Optional[int] = None) -> List[Todo]:
+        return list(self.iter_todos(only_open, offset, limit))
+
+    def export(self, path: str, only_open: bool = False) -> int:
+        """Stream tasks to `path` (JSON Lines for *.jsonl, else a JSON array); returns the count."""
+        records = (asdict(t) for t in self.iter_todos(only_open))
+        if path.endswith(".jsonl"):
+            return write_jsonl(path, records)
+        _write_snapshot(path, records)
+        return self.count(only_open)
+
+    def _due_range(self, index: SortedList, start: Optional[str], end: Optional[str],
+                   limit: Optional[int] = None) -> List[Todo]:
+        # (date, 0) sorts before every real id, (date, inf) after: both bounds inclusive
+        items = self._items()
+        keys = index.irange((start, 0) if start else None, (end, float("inf")) if end else None)
+        return [items[i] for _, i in islice(keys, limit)]
+
+    def overdue(self, today: Optional[str] = None) -> List[Todo]:
+        """Open tasks whose due date is before `today` (default: the current date)."""
+        items = self._items()
+        today = today or datetime.now().strftime(DATE_FMT)
+        return [items[i] for _, i in self._due_open.irange(None, (today, 0))]
+
+    def due_between(self, start: str, end: str, only_open: bool = False) -> List[Todo]:
+        """Tasks due from `start` to `end` (inclusive, YYYY-MM-DD), ordered by due date."""
+        self._items()
+        return self._due_range(self._due_open if only_open else self._due_all, start, end)
+
+    def next_due(self, k: int = 5, start: Optional[str] = None) -> List[Todo]:
+        """The `k` open tasks with the earliest due dates (on or after `start` if given)."""
+        self._items()
+        return self._due_range(self._due_open, start, None, limit=k)
 
     def get(self, todo_id: int) -> Optional[Todo]:
-        return next((t for t in self.todos if t.id == todo_id), None)
+        return self._items().get(todo_id)
 
+    @_exclusive
     def complete(self, todo_id: int) -> bool:
         t = self.get(todo_id)
         if not t:
             return False
-        t.done = True
-        self._save()
+        if not t.done:
+            self._before_change(t.id)
+            t.done = True
+            self._open.pop(t.id, None)
+            if t.due_date:
+                self._due_open.discard((t.due_date, t.id))
+            self._persist(t)
         return True
 
+    @_exclusive
     def delete(self, todo_id: int) -> bool:
-        before = len(self.todos)
-        self.todos = [t for t in self.todos if t.id != todo_id]
-        changed = len(self.todos) != before
-        if changed:
-            self._save()
-        return changed
+        t = self.get(todo_id)
+        if not t:
+            return False
+        self._before_change(todo_id)
+        self._unindex_todo(t)
+        self._persist_delete(todo_id)
+        return True
 
+    @_exclusive
     def update(self, todo_id: int, title: Optional[str] = None,
                due_date: Optional[str] = None, notes: Optional[str] = None) -> bool:
         t = self.get(todo_id)
         if not t:
             return False
+        if due_date:
+            try:
+                datetime.strptime(due_date, DATE_FMT)
+            except ValueError:
+                raise ValueError(f"Due date must be {DATE_FMT}")
+        self._before_change(t.id)
+        self._unindex_fields(t)
         if title:
             t.title = title
         if due_date is not None:
-            if due_date != "":
-                try:
-                    datetime.strptime(due_date, DATE_FMT)
-                except ValueError:
-                    raise ValueError(f"Due date must be {DATE_FMT}")
-                t.due_date = due_date
-            else:
-                t.due_date = None
+            t.due_date = sys.intern(due_date) if due_date != "" else None
         if notes is not None:
             t.notes = notes
-        self._save()
+        self._index_fields(t)
+        self._persist(t)
         return True
 
-    def search(self, keyword: str) -> List[Todo]:
-        k = keyword.lower()
-        return [t for t in self.todos if k in t.title.lower() or (t.notes and k in t.notes.lower())]
+    def search(self, keyword: str, prefix: bool = True) -> List[Todo]:
+        """
+        Ranked full-text search over title and notes.
+        Every word of `keyword` must match (AND); with `prefix`, a word also
+        matches longer tokens it starts with ("rep" finds "report").
+        """
+        items = self._items()
+        if not tokenize(keyword):
+            return list(items.values())
+        return [items[i] for i, _ in self._text.search(keyword, prefix)]
 
 
-def print_todos(todos: List[Todo], header: str = "Tasks"):
-    print(f"\n=== {header} ({len(todos)}) ===")
-    if not todos:
-        print("No tasks.")
-        return
+def print_todos(todos: Iterable[Todo], header: str = "Tasks", total: Optional[int] = None,
+                page_size: Optional[int] = None):
+    if total is None and hasattr(todos, "__len__"):
+        total = len(todos)
+    print(f"\n=== {header} ({total}) ===" if total is not None else f"\n=== {header} ===")
+    shown = 0
     for t in todos:
+        if page_size and shown and shown % page_size == 0:
+            if input("-- Enter for more, 'q' to stop -- ").strip().lower() == "q":
+                return
         status = "✅" if t.done else "⏳"
         due = f" | due: {t.due_date}" if t.due_date else ""
         notes = f" | notes: {t.notes}" if t.notes else ""
         print(f"[{t.id}] {status} {t.title} (created: {t.created_at}{due}{notes})")
+        shown += 1
+    if not shown:
+        print("No tasks.")
 
 
-def menu():
-    mgr = TodoManager()
+def menu(db_path: str = DB_FILE):
+    mgr = TodoManager(db_path)
     print("📝 To-Do List Manager")
     while True:
         print("\n--- Menu ---")
@@ -137,7 +1191,8 @@ def menu():
         print("5. Update task")
         print("6. Delete task")
         print("7. Search")
-        print("8. Exit")
+        print("8. Overdue / due soon")
+        print("9. Exit")
         choice = input("Choose: ").strip()
         try:
             if choice == "1":
@@ -147,9 +1202,10 @@ def menu():
                 todo = mgr.add(title, due if due else None, notes if notes else None)
                 print(f"✅ Added task #{todo.id}")
             elif choice == "2":
-                print_todos(mgr.list(), "All Tasks")
+                print_todos(mgr.iter_todos(), "All Tasks", mgr.count(), page_size=PAGE_SIZE)
             elif choice == "3":
-                print_todos(mgr.list(only_open=True), "Open Tasks")
+                print_todos(mgr.iter_todos(only_open=True), "Open Tasks", mgr.count(only_open=True),
+                            page_size=PAGE_SIZE)
             elif choice == "4":
                 tid = int(input("Task ID to complete: "))
                 print("✅ Completed" if mgr.complete(tid) else "❌ Not found")
@@ -168,6 +1224,10 @@ def menu():
                 kw = input("Keyword: ").strip()
                 print_todos(mgr.search(kw), f"Search '{kw}'")
             elif choice == "8":
+                print_todos(mgr.overdue(), "Overdue")
+                print_todos(mgr.next_due(5, start=datetime.now().strftime(DATE_FMT)), "Due Soon")
+            elif choice == "9":
+                mgr.close()
                 print("👋 Bye!")
                 break
             else:
@@ -176,5 +1236,303 @@ def menu():
             print(f"❌ {e}")
 
 
+def bench_search(size: int = 500_000, queries: int = 200) -> None:
+    """Compare indexed search against a linear substring scan."""
+    import random
+
+    rng = random.Random(42)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = ["".join(rng.choice(letters) for _ in range(rng.randint(4, 9))) for _ in range(20_000)]
+    todos = [Todo(id=i, title=" ".join(rng.sample(words, 3)) + f" #{i}",
+                  notes=" ".join(rng.sample(words, 2))) for i in range(1, size + 1)]
+    mgr = TodoManager(storage=MemoryStorage())
+    start = time.perf_counter()
+    mgr.todos = todos
+    print(f"indexed {size} todos in {time.perf_counter() - start:.2f}s")
+    qs = [" ".join(rng.sample(words, rng.randint(1, 3)))[:-2] for _ in range(queries)]
+
+    start = time.perf_counter()
+    for q in qs:
+        mgr.search(q)
+    indexed = (time.perf_counter() - start) / queries
+
+    start = time.perf_counter()
+    for q in qs[:5]:
+        k = q.lower()
+        [t for t in mgr.iter_todos() if k in t.title.lower() or (t.notes and k in t.notes.lower())]
+    scan = (time.perf_counter() - start) / 5
+    print(f"indexed search: {indexed * 1e3:.2f} ms/query, linear scan: {scan * 1e3:.2f} ms/query")
+
+
+def bench_memory(size: int = 1_000_000) -> None:
+    """Compare the heap used by `size` loaded todos: plain dataclass vs slotted + interned dates."""
+    import gc
+    import random
+    import tracemalloc
+
+    @dataclass
+    class PlainTodo:
+        id: int
+        title: str
+        done: bool = False
+        created_at: str = ""
+        due_date: Optional[str] = None
+        notes: Optional[str] = None
+
+    rng = random.Random(7)
+    days = [f"2025-{m:02d}-{d:02d}" for m in range(1, 13) for d in range(1, 29)]
+    # round-trip through JSON so every date is a separately allocated string, as after a load
+    payload = json.dumps([{"id": i, "title": f"task {i}", "done": i % 3 == 0,
+                           "created_at": rng.choice(days),
+                           "due_date": rng.choice(days) if i % 2 else None,
+                           "notes": None} for i in range(1, size + 1)])
+
+    for name, cls in (("dataclass", PlainTodo), ("slotted+interned", Todo)):
+        gc.collect()
+        tracemalloc.start()
+        records = json.loads(payload)
+        todos = [cls(**r) for r in records]
+        del records
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"{name:>18}: {used / 2**20:8.1f} MiB for {len(todos)} todos ({used / len(todos):.0f} B/todo)")
+        del todos
+
+
+def bench_bulk(n: int = 10_000) -> None:
+    """Time importing `n` tasks one add() at a time vs a single add_many() batch."""
+    import tempfile
+
+    titles = [f"imported task {i}" for i in range(n)]
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, path in (("json journal", os.path.join(tmp, "todos.json")),
+                           ("sqlite", os.path.join(tmp, "todos.db"))):
+            with TodoManager(path) as mgr:
+                start = time.perf_counter()
+                for title in titles:
+                    mgr.add(title)
+                looped = time.perf_counter() - start
+                start = time.perf_counter()
+                mgr.add_many(titles)
+                batched = time.perf_counter() - start
+            print(f"{name:>12}: add() loop {looped:.3f}s, add_many {batched:.3f}s ({looped / batched:.0f}x)")
+
+
+def _stress_worker(args: Tuple[str, int, int]) -> None:
+    path, worker, ops = args
+    with TodoManager(path) as mgr:
+        for i in range(ops):
+            mgr.add(f"worker {worker} task {i}")
+            with mgr.batch():  # read-modify-write of a shared counter
+                counter = mgr.get(1)
+                mgr.update(1, notes=str(int(counter.notes) + 1))
+
+
+def stress_concurrent(workers: int = 4, ops: int = 500) -> None:
+    """
+    Hammer one todos.json from several processes, then check that no update
+    was lost: every add is present under a unique id and a counter bumped
+    once per op with a read-modify-write equals workers * ops.
+    """
+    import multiprocessing
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "todos.json")
+        with TodoManager(path) as mgr:
+            mgr.add("counter", notes="0")
+        start = time.perf_counter()
+        with multiprocessing.Pool(workers) as pool:
+            pool.map(_stress_worker, [(path, w, ops) for w in range(workers)])
+        elapsed = time.perf_counter() - start
+        with TodoManager(path) as mgr:
+            titles = {t.title for t in mgr.iter_todos()}
+            counter = int(mgr.get(1).notes)
+            expected = {f"worker {w} task {i}" for w in range(workers) for i in range(ops)}
+            assert len(mgr) == workers * ops + 1, f"{len(mgr)} todos, expected {workers * ops + 1}"
+            assert expected <= titles, f"{len(expected - titles)} adds lost"
+            assert counter == workers * ops, f"counter {counter}, expected {workers * ops}"
+    total = workers * ops * 2
+    print(f"{workers} processes x {ops} ops: no lost updates, {total / elapsed:.0f} mutations/s")
+
+
+def bench_point_ops(sizes=(100, 10_000, 1_000_000), ops: int = 10_000) -> None:
+    """Print per-operation latency of get/complete/update/delete/add for several list sizes."""
+    import random
+
+    print(f"{'size':>10} {'get':>9} {'complete':>9} {'update':>9} {'delete':>9} {'add':>9}  (µs/op)")
+    for size in sizes:
+        mgr = TodoManager(storage=MemoryStorage())
+        mgr.todos = [Todo(id=i, title=f"task {i}") for i in range(1, size + 1)]
+        ids = [random.randint(1, size) for _ in range(ops)]
+        row = []
+        for name, op in (
+            ("get", mgr.get),
+            ("complete", mgr.complete),
+            ("update", lambda i: mgr.update(i, notes="bench")),
+            ("delete", mgr.delete),
+            ("add", lambda i: mgr.add("bench")),
+        ):
+            start = time.perf_counter()
+            for i in ids:
+                op(i)
+            row.append((time.perf_counter() - start) / ops * 1e6)
+        print(f"{size:>10} " + " ".join(f"{v:>9.2f}" for v in row))
+
+
+def _emit(todos: Iterable[Todo], header: str, as_json: bool, total: Optional[int] = None) -> None:
+    if as_json:
+        for t in todos:
+            print(json.dumps(asdict(t), ensure_ascii=False))
+    else:
+        print_todos(todos, header, total)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="todo", description="To-Do List Manager")
+    parser.add_argument("--db", default=DB_FILE, help=f"database file (default: {DB_FILE}; .db/.sqlite for SQLite)")
+    sub = parser.add_subparsers(dest="command")
+
+    p = sub.add_parser("add", help="add a task")
+    p.add_argument("title")
+    p.add_argument("--due", help=f"due date ({DATE_FMT})")
+    p.add_argument("--notes")
+
+    p = sub.add_parser("list", help="list tasks")
+    p.add_argument("--open", action="store_true", help="only open tasks")
+    p.add_argument("--json", action="store_true", help="one JSON object per line")
+    p.add_argument("--offset", type=int, default=0)
+    p.add_argument("--limit", type=int)
+
+    for name, help_text in (("complete", "mark tasks done"), ("delete", "delete tasks")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("ids", type=int, nargs="+")
+
+    p = sub.add_parser("update", help="update a task")
+    p.add_argument("id", type=int)
+    p.add_argument("--title")
+    p.add_argument("--due", help=f"new due date ({DATE_FMT}), '' to clear")
+    p.add_argument("--notes", help="new notes, '' to clear")
+
+    p = sub.add_parser("search", help="full-text search over titles and notes")
+    p.add_argument("keyword", nargs="+")
+    p.add_argument("--json", action="store_true")
+
+    p = sub.add_parser("overdue", help="open tasks past their due date")
+    p.add_argument("--json", action="store_true")
+
+    p = sub.add_parser("due", help="tasks due between two dates (inclusive)")
+    p.add_argument("start")
+    p.add_argument("end")
+    p.add_argument("--open", action="store_true")
+    p.add_argument("--json", action="store_true")
+
+    p = sub.add_parser("next", help="next open tasks by due date")
+    p.add_argument("-k", type=int, default=5)
+    p.add_argument("--json", action="store_true")
+
+    p = sub.add_parser("import", help="add tasks from a JSON array or JSON Lines file")
+    p.add_argument("file")
+
+    p = sub.add_parser("export", help="write tasks to a JSON (or .jsonl) file")
+    p.add_argument("file")
+    p.add_argument("--open", action="store_true")
+
+    sub.add_parser("batch", help="run commands read from stdin, one per line, in one process")
+    sub.add_parser("menu", help="interactive menu (default)")
+    sub.add_parser("bench", help="run the benchmarks")
+    return parser
+
+
+def run_command(mgr: TodoManager, args: argparse.Namespace) -> int:
+    """Execute one parsed subcommand against `mgr`; returns a process exit code."""
+    cmd = args.command
+    if cmd == "add":
+        todo = mgr.add(args.title, args.due, args.notes)
+        print(f"✅ Added task #{todo.id}")
+    elif cmd == "list":
+        todos = mgr.iter_todos(args.open, args.offset, args.limit)
+        _emit(todos, "Open Tasks" if args.open else "All Tasks", args.json,
+              None if args.limit is not None else mgr.count(args.open))
+    elif cmd == "complete":
+        found = mgr.complete_many(args.ids)
+        print(f"✅ Completed {found}/{len(args.ids)}")
+        return 0 if found == len(args.ids) else 1
+    elif cmd == "delete":
+        found = mgr.delete_many(args.ids)
+        print(f"🗑️ Deleted {found}/{len(args.ids)}")
+        return 0 if found == len(args.ids) else 1
+    elif cmd == "update":
+        if not mgr.update(args.id, args.title, args.due, args.notes):
+            print("❌ Not found")
+            return 1
+        print("✅ Updated")
+    elif cmd == "search":
+        kw = " ".join(args.keyword)
+        _emit(mgr.search(kw), f"Search '{kw}'", args.json)
+    elif cmd == "overdue":
+        _emit(mgr.overdue(), "Overdue", args.json)
+    elif cmd == "due":
+        _emit(mgr.due_between(args.start, args.end, args.open), f"Due {args.start}..{args.end}", args.json)
+    elif cmd == "next":
+        _emit(mgr.next_due(args.k, start=datetime.now().strftime(DATE_FMT)), "Due Soon", args.json)
+    elif cmd == "import":
+        added = mgr.add_many(read_records(args.file))
+        print(f"✅ Imported {len(added)} tasks")
+    elif cmd == "export":
+        print(f"✅ Exported {mgr.export(args.file, args.open)} tasks to {args.file}")
+    return 0
+
+
+def run_batch(mgr: TodoManager, lines: Iterable[str], parser: argparse.ArgumentParser) -> int:
+    """
+    Run one subcommand per input line (shell-quoted, '#' comments allowed)
+    inside a single batch, so the whole script costs one load and one flush.
+    A failing line is reported and skipped; returns the number of failures.
+    """
+    failures = 0
+    with mgr.batch():
+        for lineno, line in enumerate(lines, start=1):
+            try:
+                argv = shlex.split(line, comments=True)
+                if not argv:
+                    continue
+                args = parser.parse_args(argv)
+                if args.command in (None, "batch", "menu", "bench"):
+                    raise ValueError(f"'{argv[0]}' is not allowed in batch mode")
+                if run_command(mgr, args):
+                    failures += 1
+            except SystemExit:  # argparse already printed the usage error
+                failures += 1
+            except (ValueError, OSError) as e:
+                print(f"❌ line {lineno}: {e}", file=sys.stderr)
+                failures += 1
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command in (None, "menu"):
+        menu(args.db)
+        return 0
+    if args.command == "bench":
+        bench_point_ops()
+        bench_search()
+        bench_memory()
+        bench_bulk()
+        stress_concurrent()
+        return 0
+    with TodoManager(args.db) as mgr:
+        try:
+            if args.command == "batch":
+                return 1 if run_batch(mgr, sys.stdin, parser) else 0
+            return run_command(mgr, args)
+        except (ValueError, OSError) as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+
+
 if __name__ == "__main__":
-    menu()
\ No newline at end of file
+    sys.exit(main())